@@ -1,4 +1,4 @@
-from .api import convert_xlsx_to_html, convert_xlsx_to_markdown, load_xlsx
+from .api import convert_xlsx_to_html, convert_xlsx_to_markdown, load_xlsx, write_xlsx_html, write_xlsx_markdown
 from .model import ConvertOptions, WorkbookDoc
 
 __all__ = [
@@ -7,4 +7,6 @@ __all__ = [
     "load_xlsx",
     "convert_xlsx_to_markdown",
     "convert_xlsx_to_html",
+    "write_xlsx_html",
+    "write_xlsx_markdown",
 ]
@@ -4,8 +4,8 @@ from pathlib import Path
 
 from .model import ConvertOptions, WorkbookDoc
 from .parser.ooxml import OOXMLWorkbookParser
-from .render_html import render_workbook_html
-from .render_markdown import render_workbook_markdown
+from .render_html import iter_workbook_html, render_workbook_html
+from .render_markdown import iter_workbook_markdown, render_workbook_markdown
 
 
 def _parse_xlsx(path: str | Path, *, options: ConvertOptions | None = None) -> WorkbookDoc:
@@ -14,17 +14,63 @@ def _parse_xlsx(path: str | Path, *, options: ConvertOptions | None = None) -> W
     return parser.parse()
 
 
-def load_xlsx(path: str | Path, *, options: ConvertOptions | None = None) -> WorkbookDoc:
+def load_xlsx(
+    path: str | Path,
+    *,
+    options: ConvertOptions | None = None,
+    compact: bool = False,
+    workers: int | None = None,
+) -> WorkbookDoc:
     workbook = _parse_xlsx(path, options=options)
-    workbook.markdown = render_workbook_markdown(workbook)
+    workbook.markdown = render_workbook_markdown(workbook, compact=compact, workers=workers)
     return workbook
 
 
-def convert_xlsx_to_markdown(path: str | Path, *, options: ConvertOptions | None = None) -> str:
+def convert_xlsx_to_markdown(
+    path: str | Path,
+    *,
+    options: ConvertOptions | None = None,
+    compact: bool = False,
+    workers: int | None = None,
+) -> str:
     workbook = _parse_xlsx(path, options=options)
-    return render_workbook_markdown(workbook)
+    return render_workbook_markdown(workbook, compact=compact, workers=workers)
 
 
-def convert_xlsx_to_html(path: str | Path, *, options: ConvertOptions | None = None) -> str:
+def write_xlsx_markdown(
+    path: str | Path,
+    output: str | Path,
+    *,
+    options: ConvertOptions | None = None,
+    compact: bool = False,
+    workers: int | None = None,
+) -> None:
     workbook = _parse_xlsx(path, options=options)
-    return render_workbook_html(workbook)
+    # Render before opening, so a failure leaves an existing output file untouched.
+    chunks = list(iter_workbook_markdown(workbook, compact=compact, workers=workers))
+    with Path(output).open("w", encoding="utf-8", buffering=1 << 20) as fh:
+        fh.writelines(chunks)
+
+
+def convert_xlsx_to_html(
+    path: str | Path,
+    *,
+    options: ConvertOptions | None = None,
+    workers: int | None = None,
+) -> str:
+    workbook = _parse_xlsx(path, options=options)
+    return render_workbook_html(workbook, workers=workers)
+
+
+def write_xlsx_html(
+    path: str | Path,
+    output: str | Path,
+    *,
+    options: ConvertOptions | None = None,
+    workers: int | None = None,
+) -> None:
+    workbook = _parse_xlsx(path, options=options)
+    # Render every chunk before opening, so a failure leaves an existing output file untouched.
+    chunks = list(iter_workbook_html(workbook, workers=workers))
+    with Path(output).open("w", encoding="utf-8", buffering=1 << 20) as fh:
+        fh.writelines(chunks)
@@ -3,7 +3,7 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-from .api import convert_xlsx_to_html, load_xlsx
+from .api import write_xlsx_html, write_xlsx_markdown
 from .model import ConvertOptions
 
 
@@ -32,6 +32,17 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Output standalone HTML (sheet-view reproduction)",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Omit empty (none) sections from Markdown output",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Render sheets in this many worker processes",
+    )
     return parser
 
 
@@ -44,12 +55,10 @@ def main() -> int:
         output_mode="full" if args.full else ("sheetview" if args.sheetview else "work"),
     )
     if args.html:
-        html = convert_xlsx_to_html(args.input, options=options)
-        args.output.write_text(html, encoding="utf-8")
+        write_xlsx_html(args.input, args.output, options=options, workers=args.workers)
         return 0
 
-    workbook = load_xlsx(args.input, options=options)
-    args.output.write_text(workbook.markdown, encoding="utf-8")
+    write_xlsx_markdown(args.input, args.output, options=options, compact=args.compact, workers=args.workers)
     return 0
 
 
@@ -120,7 +120,7 @@ class RegionCellRow:
     cell_type: str
     style_id: str | None
     merge_ref: str | None
-    flags: list[str] = field(default_factory=list)
+    flags: tuple[str, ...] = ()
 
 
 @dataclass(slots=True)
@@ -139,8 +139,10 @@ class SheetDoc:
     dimension_ref: str
     cells: list[CellData] = field(default_factory=list)
     cell_map: dict[str, CellData] = field(default_factory=dict)
+    cell_rc_map: dict[tuple[int, int], CellData] = field(default_factory=dict)
     merges: list[RangeRef] = field(default_factory=list)
     merge_map: dict[str, str] = field(default_factory=dict)
+    merge_rc_map: dict[tuple[int, int], str] = field(default_factory=dict)
     data_validations: list[DataValidation] = field(default_factory=list)
     row_heights: dict[int, float] = field(default_factory=dict)
     col_widths: dict[int, float] = field(default_factory=dict)
@@ -112,6 +112,7 @@ def _walk_drawing_object(
     object_uid = raw_uid if uid_counter[raw_uid] == 1 else f"{raw_uid}#{uid_counter[raw_uid]}"
 
     text = _extract_text(element)
+    raw_xml = ET.tostring(element, encoding="unicode")
     image_target = None
     image_content_type = None
     image_data_uri = None
@@ -147,7 +148,7 @@ def _walk_drawing_object(
         image_target=image_target,
         image_content_type=image_content_type,
         image_data_uri=image_data_uri,
-        raw_xml=ET.tostring(element, encoding="unicode"),
+        raw_xml=raw_xml,
         extra=extra,
     )
     drawing_objects.append(obj)
@@ -171,7 +172,7 @@ def _walk_drawing_object(
                 resolved=False,
                 distance_source=None,
                 distance_target=None,
-                raw_xml=ET.tostring(element, encoding="unicode"),
+                raw_xml=raw_xml,
             )
         )
 
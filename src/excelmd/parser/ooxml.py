@@ -30,6 +30,8 @@ from .utils import (
     xml_to_dict,
 )
 
+_DATE_TOKEN_RE = re.compile(r"(?:^|[^\\])(?:y+|m+|d+|h+|s+|AM/PM)", re.IGNORECASE)
+
 
 @dataclass(slots=True)
 class _SheetRef:
@@ -77,7 +79,6 @@ class OOXMLWorkbookParser:
             48: "##0.0E+0",
             49: "@",
         }
-        self._date_token_re = re.compile(r"(?:^|[^\\])(?:y+|m+|d+|h+|s+|AM/PM)", re.IGNORECASE)
 
     def parse(self) -> WorkbookDoc:
         if self.source_path.suffix.lower() != ".xlsx":
@@ -555,6 +556,7 @@ class OOXMLWorkbookParser:
                 )
                 sheet.cells.append(cell)
                 sheet.cell_map[coord] = cell
+                sheet.cell_rc_map[(row, col)] = cell
 
         for col_elem in root.findall(".//a:cols/a:col", NS):
             start = int(col_elem.attrib.get("min", "0"))
@@ -597,7 +599,7 @@ class OOXMLWorkbookParser:
             direct = inline.find("a:t", NS)
             if direct is not None:
                 return direct.text or ""
-            return "".join((node.text or "") for node in inline.findall(".//a:t", NS))
+            return "".join([node.text or "" for node in inline.findall(".//a:t", NS)])
 
         if cell_type == "str":
             return cached_value or ""
@@ -641,7 +643,7 @@ class OOXMLWorkbookParser:
 
     def _is_date_format(self, fmt: str) -> bool:
         cleaned = self._strip_quoted(fmt)
-        return bool(self._date_token_re.search(cleaned))
+        return bool(_DATE_TOKEN_RE.search(cleaned))
 
     def _strip_quoted(self, fmt: str) -> str:
         out: list[str] = []
@@ -703,6 +705,7 @@ class OOXMLWorkbookParser:
             for row, col in iter_cells_in_range(rng):
                 coord = self._row_col_to_coord(row, col)
                 sheet.merge_map[coord] = rng.ref
+                sheet.merge_rc_map[(row, col)] = rng.ref
 
     def _parse_data_validations(self, root: ET.Element, sheet: SheetDoc) -> None:
         for dv in root.findall(".//a:dataValidations/a:dataValidation", NS):
@@ -848,14 +851,23 @@ class OOXMLWorkbookParser:
         return f"{parent}/_rels/{file_name}.rels"
 
     def _build_summary(self, workbook: WorkbookDoc) -> dict[str, int]:
-        total_cells = sum(len(sheet.cells) for sheet in workbook.sheets)
-        total_merges = sum(len(sheet.merges) for sheet in workbook.sheets)
-        total_formulas = sum(1 for sheet in workbook.sheets for cell in sheet.cells if cell.formula)
-        total_drawings = sum(len(sheet.drawings) for sheet in workbook.sheets)
-        total_connectors = sum(len(sheet.connectors) for sheet in workbook.sheets)
-        total_images = sum(1 for sheet in workbook.sheets for obj in sheet.drawings if obj.image_data_uri)
-        total_regions = sum(len(sheet.regions) for sheet in workbook.sheets)
-        total_unsupported = sum(len(sheet.unsupported) for sheet in workbook.sheets)
+        total_cells = 0
+        total_merges = 0
+        total_formulas = 0
+        total_drawings = 0
+        total_connectors = 0
+        total_images = 0
+        total_regions = 0
+        total_unsupported = 0
+        for sheet in workbook.sheets:
+            total_cells += len(sheet.cells)
+            total_merges += len(sheet.merges)
+            total_formulas += sum(1 for cell in sheet.cells if cell.formula)
+            total_drawings += len(sheet.drawings)
+            total_connectors += len(sheet.connectors)
+            total_images += sum(1 for obj in sheet.drawings if obj.image_data_uri)
+            total_regions += len(sheet.regions)
+            total_unsupported += len(sheet.unsupported)
 
         return {
             "sheet_count": len(workbook.sheets),
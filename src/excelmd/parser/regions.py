@@ -1,56 +1,124 @@
 from __future__ import annotations
 
 from collections import deque
+from typing import Callable, Iterable
 
 from ..model import CellRegion, RangeRef, RegionCellRow, SheetDoc
-from .utils import iter_cells_in_range, parse_range_ref, parse_sqref, rowcol_to_coord
+from .utils import parse_range_ref, parse_sqref, rowcol_to_coord
+
+_FLAG_NAMES = (
+    "merged",
+    "data_validation",
+    "virtual",
+    "has_value",
+    "has_formula",
+    "has_cached",
+    "non_default_style",
+)
+_FLAG_MERGED = 1 << 0
+_FLAG_DATA_VALIDATION = 1 << 1
+_FLAG_VIRTUAL = 1 << 2
+_FLAG_HAS_VALUE = 1 << 3
+_FLAG_HAS_FORMULA = 1 << 4
+_FLAG_HAS_CACHED = 1 << 5
+_FLAG_NON_DEFAULT_STYLE = 1 << 6
+_FLAG_TUPLES: dict[int, tuple[str, ...]] = {}
+_MAX_GRID_CELLS = 1 << 22
 
 
 def build_sheet_regions(sheet: SheetDoc) -> list[CellRegion]:
-    base_ranges = sheet.print_areas[:] if sheet.print_areas else _fallback_base_ranges(sheet)
+    if sheet.print_areas:
+        base_ranges = sheet.print_areas[:]
+        cells_in_base = False
+    else:
+        base_ranges, cells_in_base = _fallback_base_ranges(sheet)
     if not base_ranges:
         return []
 
-    def in_base(row: int, col: int) -> bool:
-        for rng in base_ranges:
-            if rng.start_row <= row <= rng.end_row and rng.start_col <= col <= rng.end_col:
-                return True
-        return False
+    if len(base_ranges) == 1:
+        only = base_ranges[0]
+        sr, er, sc, ec = only.start_row, only.end_row, only.start_col, only.end_col
 
-    occupied: set[tuple[int, int]] = set()
+        def in_base(row: int, col: int) -> bool:
+            return sr <= row <= er and sc <= col <= ec
 
-    for cell in sheet.cells:
-        if not in_base(cell.row, cell.col):
-            continue
-        if cell.value or cell.formula or (cell.style_id not in (None, "0")):
-            occupied.add((cell.row, cell.col))
-
-    for merge_rng in sheet.merges:
-        for row, col in iter_cells_in_range(merge_rng):
-            if in_base(row, col):
-                occupied.add((row, col))
+    else:
 
-    dv_coords: set[tuple[int, int]] = set()
-    for dv in sheet.data_validations:
-        for rng in parse_sqref(dv.sqref):
-            for row, col in iter_cells_in_range(rng):
-                if in_base(row, col):
-                    dv_coords.add((row, col))
-                    occupied.add((row, col))
+        def in_base(row: int, col: int) -> bool:
+            for rng in base_ranges:
+                if rng.start_row <= row <= rng.end_row and rng.start_col <= col <= rng.end_col:
+                    return True
+            return False
 
-    if not occupied:
+    dv_ranges = [rng for dv in sheet.data_validations for rng in parse_sqref(dv.sqref)]
+    top, left, bottom, right = _occupancy_bounds(sheet, base_ranges, dv_ranges)
+    if top > bottom or left > right:
         return []
 
-    components = _connected_components(occupied)
-    components.sort(key=lambda comp: (min(r for r, _ in comp), min(c for _, c in comp)))
+    width = right - left + 1
+    area = (bottom - top + 1) * width
+    use_grid = area <= _MAX_GRID_CELLS
 
-    regions: list[CellRegion] = []
-    for region_idx, component in enumerate(components, start=1):
-        min_row = min(row for row, _ in component)
-        max_row = max(row for row, _ in component)
+    if use_grid:
+        occupied_grid = bytearray(area)
+        dv_grid = bytearray(area)
+
+        def occupy(row: int, col: int) -> None:
+            occupied_grid[(row - top) * width + col - left] = 1
+
+        def occupy_dv(row: int, col: int) -> None:
+            idx = (row - top) * width + col - left
+            occupied_grid[idx] = 1
+            dv_grid[idx] = 1
+
+    else:
+        occupied: set[tuple[int, int]] = set()
+        dv_coords: set[tuple[int, int]] = set()
+
+        def occupy(row: int, col: int) -> None:
+            occupied.add((row, col))
+
+        def occupy_dv(row: int, col: int) -> None:
+            occupied.add((row, col))
+            dv_coords.add((row, col))
+
+    bounds = (top, left, bottom, right)
+    _mark_occupied(sheet, cells_in_base, in_base, dv_ranges, bounds, occupy, occupy_dv)
+
+    if use_grid:
+        if occupied_grid.find(1) == -1:
+            return []
+        found = _grid_components(occupied_grid, top, left, width)
+
+        def is_dv(point: tuple[int, int]) -> bool:
+            return dv_grid[(point[0] - top) * width + point[1] - left] == 1
+
+    else:
+        if not occupied:
+            return []
+        found = _connected_components(occupied)
+        is_dv = dv_coords.__contains__
+
+    components: list[tuple[int, int, int, int, list[tuple[int, int]]]] = []
+    for component in found:
         min_col = min(col for _, col in component)
         max_col = max(col for _, col in component)
+        components.append((component[0][0], min_col, component[-1][0], max_col, component))
+    if use_grid and len({(item[0], item[1]) for item in components}) < len(components):
+        # Ties on (min_row, min_col) keep the order the set-based search discovers them in.
+        discovered: set[tuple[int, int]] = set()
+
+        def discover(row: int, col: int) -> None:
+            discovered.add((row, col))
 
+        _mark_occupied(sheet, cells_in_base, in_base, dv_ranges, bounds, discover, discover)
+        discovery = {comp[0]: idx for idx, comp in enumerate(_connected_components(discovered))}
+        components.sort(key=lambda item: (item[0], item[1], discovery[item[4][0]]))
+    else:
+        components.sort(key=lambda item: (item[0], item[1]))
+
+    regions: list[CellRegion] = []
+    for region_idx, (min_row, min_col, max_row, max_col, component) in enumerate(components, start=1):
         bounds_ref = f"{rowcol_to_coord(min_row, min_col)}:{rowcol_to_coord(max_row, max_col)}"
         bounds = RangeRef(
             ref=bounds_ref,
@@ -61,15 +129,15 @@ def build_sheet_regions(sheet: SheetDoc) -> list[CellRegion]:
         )
 
         rows: list[RegionCellRow] = []
-        for row, col in sorted(component):
-            coord = rowcol_to_coord(row, col)
-            cell = sheet.cell_map.get(coord)
-            merge_ref = sheet.merge_map.get(coord)
-            flags: list[str] = []
-            if merge_ref is not None:
-                flags.append("merged")
-            if (row, col) in dv_coords:
-                flags.append("data_validation")
+        cell_rc_map = sheet.cell_rc_map
+        merge_rc_map = sheet.merge_rc_map
+        for point in component:
+            cell = cell_rc_map.get(point)
+            merge_ref = merge_rc_map.get(point)
+            coord = rowcol_to_coord(*point)
+            mask = _FLAG_MERGED if merge_ref is not None else 0
+            if is_dv(point):
+                mask |= _FLAG_DATA_VALIDATION
 
             if cell is None:
                 rows.append(
@@ -81,19 +149,19 @@ def build_sheet_regions(sheet: SheetDoc) -> list[CellRegion]:
                         cell_type="virtual",
                         style_id=None,
                         merge_ref=merge_ref,
-                        flags=flags + ["virtual"],
+                        flags=_flags_for(mask | _FLAG_VIRTUAL),
                     )
                 )
                 continue
 
             if cell.value:
-                flags.append("has_value")
+                mask |= _FLAG_HAS_VALUE
             if cell.formula:
-                flags.append("has_formula")
+                mask |= _FLAG_HAS_FORMULA
             if cell.cached_value not in (None, ""):
-                flags.append("has_cached")
+                mask |= _FLAG_HAS_CACHED
             if cell.style_id not in (None, "0"):
-                flags.append("non_default_style")
+                mask |= _FLAG_NON_DEFAULT_STYLE
 
             rows.append(
                 RegionCellRow(
@@ -104,7 +172,7 @@ def build_sheet_regions(sheet: SheetDoc) -> list[CellRegion]:
                     cell_type=cell.cell_type,
                     style_id=cell.style_id,
                     merge_ref=merge_ref,
-                    flags=flags,
+                    flags=_flags_for(mask),
                 )
             )
 
@@ -113,42 +181,166 @@ def build_sheet_regions(sheet: SheetDoc) -> list[CellRegion]:
     return regions
 
 
-def _connected_components(points: set[tuple[int, int]]) -> list[set[tuple[int, int]]]:
+def _mark_occupied(
+    sheet: SheetDoc,
+    cells_in_base: bool,
+    in_base: Callable[[int, int], bool],
+    dv_ranges: list[RangeRef],
+    bounds: tuple[int, int, int, int],
+    occupy: Callable[[int, int], None],
+    occupy_dv: Callable[[int, int], None],
+) -> None:
+    for cell in sheet.cells:
+        if not cells_in_base and not in_base(cell.row, cell.col):
+            continue
+        if cell.value or cell.formula or (cell.style_id not in (None, "0")):
+            occupy(cell.row, cell.col)
+
+    for merge_rng in sheet.merges:
+        for row, col in _iter_clipped(merge_rng, *bounds):
+            if in_base(row, col):
+                occupy(row, col)
+
+    for rng in dv_ranges:
+        for row, col in _iter_clipped(rng, *bounds):
+            if in_base(row, col):
+                occupy_dv(row, col)
+
+
+def _occupancy_bounds(
+    sheet: SheetDoc,
+    base_ranges: list[RangeRef],
+    dv_ranges: list[RangeRef],
+) -> tuple[int, int, int, int]:
+    top = min(rng.start_row for rng in base_ranges)
+    left = min(rng.start_col for rng in base_ranges)
+    bottom = max(rng.end_row for rng in base_ranges)
+    right = max(rng.end_col for rng in base_ranges)
+    if (bottom - top + 1) * (right - left + 1) <= _MAX_GRID_CELLS:
+        return top, left, bottom, right
+
+    # Oversized base (e.g. a whole-sheet dimension): shrink to what can be occupied.
+    content_top = content_left = 1 << 30
+    content_bottom = content_right = 0
+    for cell in sheet.cells:
+        row = cell.row
+        col = cell.col
+        if row < content_top:
+            content_top = row
+        if row > content_bottom:
+            content_bottom = row
+        if col < content_left:
+            content_left = col
+        if col > content_right:
+            content_right = col
+    for rng in (*sheet.merges, *dv_ranges):
+        content_top = min(content_top, rng.start_row)
+        content_left = min(content_left, rng.start_col)
+        content_bottom = max(content_bottom, rng.end_row)
+        content_right = max(content_right, rng.end_col)
+
+    return (
+        max(top, content_top),
+        max(left, content_left),
+        min(bottom, content_bottom),
+        min(right, content_right),
+    )
+
+
+def _iter_clipped(rng: RangeRef, top: int, left: int, bottom: int, right: int) -> Iterable[tuple[int, int]]:
+    for row in range(max(rng.start_row, top), min(rng.end_row, bottom) + 1):
+        for col in range(max(rng.start_col, left), min(rng.end_col, right) + 1):
+            yield row, col
+
+
+def _grid_components(grid: bytearray, top: int, left: int, width: int) -> list[list[tuple[int, int]]]:
+    size = len(grid)
+    components: list[list[tuple[int, int]]] = []
+
+    start = grid.find(1)
+    while start != -1:
+        grid[start] = 2
+        stack = [start]
+        members = [start]
+        while stack:
+            idx = stack.pop()
+            col_off = idx % width
+            for neighbor in (
+                idx - 1 if col_off else -1,
+                idx + 1 if col_off + 1 < width else -1,
+                idx - width,
+                idx + width,
+            ):
+                if 0 <= neighbor < size and grid[neighbor] == 1:
+                    grid[neighbor] = 2
+                    stack.append(neighbor)
+                    members.append(neighbor)
+
+        members.sort()
+        components.append([(top + idx // width, left + idx % width) for idx in members])
+        start = grid.find(1, start + 1)
+
+    return components
+
+
+def _connected_components(points: set[tuple[int, int]]) -> list[list[tuple[int, int]]]:
     remaining = set(points)
-    components: list[set[tuple[int, int]]] = []
+    labels: dict[tuple[int, int], int] = {}
+    count = 0
 
     while remaining:
         start = remaining.pop()
         queue = deque([start])
-        comp = {start}
+        labels[start] = count
 
         while queue:
             row, col = queue.popleft()
             for neighbor in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
                 if neighbor in remaining:
                     remaining.remove(neighbor)
-                    comp.add(neighbor)
+                    labels[neighbor] = count
                     queue.append(neighbor)
 
-        components.append(comp)
+        count += 1
+
+    cols_by_row: dict[int, list[int]] = {}
+    for row, col in points:
+        cols_by_row.setdefault(row, []).append(col)
+
+    components: list[list[tuple[int, int]]] = [[] for _ in range(count)]
+    for row in sorted(cols_by_row):
+        cols = cols_by_row[row]
+        cols.sort()
+        for col in cols:
+            point = (row, col)
+            components[labels[point]].append(point)
 
     return components
 
 
-def _fallback_base_ranges(sheet: SheetDoc) -> list[RangeRef]:
+def _fallback_base_ranges(sheet: SheetDoc) -> tuple[list[RangeRef], bool]:
     if sheet.dimension_ref:
         try:
-            return [parse_range_ref(sheet.dimension_ref)]
+            return [parse_range_ref(sheet.dimension_ref)], False
         except ValueError:
             pass
 
     if not sheet.cells:
-        return []
+        return [], False
 
-    min_row = min(cell.row for cell in sheet.cells)
-    max_row = max(cell.row for cell in sheet.cells)
-    min_col = min(cell.col for cell in sheet.cells)
-    max_col = max(cell.col for cell in sheet.cells)
+    min_row = min_col = 1 << 30
+    max_row = max_col = 0
+    for cell in sheet.cells:
+        row = cell.row
+        col = cell.col
+        if row < min_row:
+            min_row = row
+        if row > max_row:
+            max_row = row
+        if col < min_col:
+            min_col = col
+        if col > max_col:
+            max_col = col
     ref = f"{rowcol_to_coord(min_row, min_col)}:{rowcol_to_coord(max_row, max_col)}"
     return [
         RangeRef(
@@ -158,4 +350,12 @@ def _fallback_base_ranges(sheet: SheetDoc) -> list[RangeRef]:
             end_row=max_row,
             end_col=max_col,
         )
-    ]
+    ], True
+
+
+def _flags_for(mask: int) -> tuple[str, ...]:
+    flags = _FLAG_TUPLES.get(mask)
+    if flags is None:
+        flags = tuple(name for bit, name in enumerate(_FLAG_NAMES) if mask >> bit & 1)
+        _FLAG_TUPLES[mask] = flags
+    return flags
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import posixpath
 import re
+from functools import lru_cache
 from typing import Iterable
 
 from ..model import RangeRef
 
 CELL_RE = re.compile(r"^\$?([A-Z]+)\$?(\d+)$")
-RANGE_RE = re.compile(r"^\$?([A-Z]+)\$?(\d+):\$?([A-Z]+)\$?(\d+)$")
+REF_RE = re.compile(r"\$?([A-Z]+)\$?(\d+)(?::\$?([A-Z]+)\$?(\d+))?")
+SQREF_TOKEN_RE = re.compile(rf"(?<!\S){REF_RE.pattern}(?!\S)")
 SHEET_RANGE_RE = re.compile(r"^(?:'([^']+)'|([^!]+))!(.+)$")
 
 
@@ -24,6 +25,7 @@ def col_to_index(col: str) -> int:
     return value
 
 
+@lru_cache(maxsize=16384)
 def index_to_col(index: int) -> str:
     if index < 1:
         raise ValueError("Column index must be >= 1")
@@ -51,28 +53,28 @@ def rowcol_to_coord(row: int, col: int) -> str:
 
 
 def parse_range_ref(ref: str) -> RangeRef:
-    normalized = ref.replace("$", "")
-    range_match = RANGE_RE.match(normalized)
-    if range_match:
-        sc = col_to_index(range_match.group(1))
-        sr = int(range_match.group(2))
-        ec = col_to_index(range_match.group(3))
-        er = int(range_match.group(4))
-        return RangeRef(
-            ref=normalized,
-            start_row=min(sr, er),
-            start_col=min(sc, ec),
-            end_row=max(sr, er),
-            end_col=max(sc, ec),
-        )
-
-    cell_match = CELL_RE.match(normalized)
-    if not cell_match:
+    match = REF_RE.fullmatch(ref.replace("$", ""))
+    if not match:
         raise ValueError(f"Invalid range reference: {ref}")
+    return _range_from_match(match)
+
+
+def _range_from_match(match: re.Match[str]) -> RangeRef:
+    start_letters, start_digits, end_letters, end_digits = match.groups()
+    sc = col_to_index(start_letters)
+    sr = int(start_digits)
+    if end_letters is None:
+        return RangeRef(ref=f"{start_letters}{start_digits}", start_row=sr, start_col=sc, end_row=sr, end_col=sc)
 
-    col = col_to_index(cell_match.group(1))
-    row = int(cell_match.group(2))
-    return RangeRef(ref=normalized, start_row=row, start_col=col, end_row=row, end_col=col)
+    ec = col_to_index(end_letters)
+    er = int(end_digits)
+    return RangeRef(
+        ref=f"{start_letters}{start_digits}:{end_letters}{end_digits}",
+        start_row=min(sr, er),
+        start_col=min(sc, ec),
+        end_row=max(sr, er),
+        end_col=max(sc, ec),
+    )
 
 
 def parse_sheet_scoped_range(value: str) -> list[RangeRef]:
@@ -99,16 +101,7 @@ def parse_sheet_scoped_range(value: str) -> list[RangeRef]:
 
 
 def parse_sqref(sqref: str) -> list[RangeRef]:
-    refs: list[RangeRef] = []
-    for token in sqref.split():
-        token = token.strip()
-        if not token:
-            continue
-        try:
-            refs.append(parse_range_ref(token))
-        except ValueError:
-            continue
-    return refs
+    return [_range_from_match(match) for match in SQREF_TOKEN_RE.finditer(sqref)]
 
 
 def iter_cells_in_range(rng: RangeRef) -> Iterable[tuple[int, int]]:
@@ -117,22 +110,55 @@ def iter_cells_in_range(rng: RangeRef) -> Iterable[tuple[int, int]]:
             yield row, col
 
 
+@lru_cache(maxsize=4096)
 def resolve_target(base_path: str, target: str) -> str:
-    joined = posixpath.normpath(posixpath.join(posixpath.dirname(base_path), target))
-    if joined.startswith("/"):
-        joined = joined[1:]
-    return joined
+    if target.startswith("/"):
+        absolute = True
+        joined = target
+    else:
+        base_dir = base_path.rpartition("/")[0]
+        absolute = base_path.startswith("/")
+        joined = f"{base_dir}/{target}" if base_dir else target
+
+    segments: list[str] = []
+    for segment in joined.split("/"):
+        if not segment or segment == ".":
+            continue
+        if segment == "..":
+            if segments and segments[-1] != "..":
+                segments.pop()
+            elif not absolute:
+                segments.append("..")
+            continue
+        segments.append(segment)
+
+    if not segments and not absolute:
+        return "."
+    return "/".join(segments)
 
 
 def xml_to_dict(element) -> dict:
-    children = [xml_to_dict(child) for child in list(element)]
-    text = (element.text or "").strip()
+    root = _xml_node_dict(element)
+    stack = [(element, root)]
+    while stack:
+        current, payload = stack.pop()
+        if not len(current):
+            continue
+        children = [_xml_node_dict(child) for child in current]
+        payload["children"] = children
+        stack.extend(zip(current, children))
+    return root
+
+
+def _xml_node_dict(element) -> dict:
+    attrib = element.attrib
     payload: dict[str, object] = {
         "tag": local_name(element.tag),
-        "attrs": dict(sorted(element.attrib.items())),
+        "attrs": dict(sorted(attrib.items())) if len(attrib) > 1 else dict(attrib),
     }
+    text = element.text
     if text:
-        payload["text"] = text
-    if children:
-        payload["children"] = children
+        text = text.strip()
+        if text:
+            payload["text"] = text
     return payload
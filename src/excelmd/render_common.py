@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import json
+from html import escape as html_escape
+
+from .model import RangeRef, SheetDoc
+from .parser.utils import parse_range_ref
+
+
+def sheetview_ranges(sheet: SheetDoc) -> list[RangeRef]:
+    if sheet.print_areas:
+        return sheet.print_areas
+    try:
+        return [parse_range_ref(sheet.dimension_ref)]
+    except ValueError:
+        return []
+
+
+def build_style_attrs(style_css_map: dict[str, str]) -> dict[str, str]:
+    by_css: dict[str, str] = {}
+    style_attrs: dict[str, str] = {}
+    for style_id, css in style_css_map.items():
+        if not css:
+            continue
+        attr = by_css.get(css)
+        if attr is None:
+            text = css if css.strip().endswith(";") else css + ";"
+            attr = by_css[css] = f' style="{html_escape(text)}"'
+        style_attrs[style_id] = attr
+    return style_attrs
+
+
+def kv_value_text(value: object) -> str:
+    if type(value) is str:
+        return value
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
@@ -1,110 +1,157 @@
 from __future__ import annotations
 
+import io
 import json
 import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from html import escape as html_escape
+from itertools import accumulate, compress, repeat
+from operator import mul
 
 from .model import AnchorPoint, SheetDoc, WorkbookDoc
-from .parser.utils import index_to_col, parse_range_ref, rowcol_to_coord
+from .parser.utils import index_to_col, parse_range_ref
+from .render_common import build_style_attrs, kv_value_text, sheetview_ranges
 
 EMU_PER_PIXEL = 9525.0
 ROW_HEADER_WIDTH = 56.0
 COL_HEADER_HEIGHT = 24.0
+# Excel columns top out at 16384, so 15 bits keep packed (row, col) keys unique.
+_COORD_SHIFT = 15
+_ROW_CACHE_LIMIT = 4096
+_HF_TOKEN_RE = re.compile(r'&(?:&|"[^"]*"|K[0-9A-Fa-f]{6}|[0-9]+|[BIESUXYPNDTFZGA])')
+_HF_SPACE_RE = re.compile(r"\s+")
+_HF_SECTION_RE = re.compile(r"&([LCR])")
+_HF_TOKEN_TEXT = {
+    "P": "{page}",
+    "N": "{pages}",
+    "D": "{date}",
+    "T": "{time}",
+    "F": "{file}",
+    "Z": "{path}",
+    "G": "{image}",
+}
 
+_DOC_HEAD = (
+    "<!doctype html>\n"
+    '<html lang="ja">\n'
+    "<head>\n"
+    '<meta charset="utf-8">\n'
+    '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+    "<title>%s - SheetView HTML</title>\n"
+    "%s\n"
+    "</head>\n"
+    "<body>\n"
+    '<main class="page">\n'
+    "<h1>Workbook: %s</h1>\n"
+)
+_DOC_TAIL = "</main>\n</body>\n</html>\n"
+
+
+def render_workbook_html(workbook: WorkbookDoc, *, workers: int | None = None) -> str:
+    return "".join(iter_workbook_html(workbook, workers=workers))
+
+
+def iter_workbook_html(workbook: WorkbookDoc, *, workers: int | None = None) -> Iterator[str]:
+    buf = io.StringIO()
+    w = buf.write
+
+    title = html_escape(workbook.source_path.name)
+    w(_DOC_HEAD % (title, _HTML_CSS, title))
+
+    w("<section>\n")
+    w("<h2>Source Metadata</h2>\n")
+    _kv_table(w, workbook.source_metadata)
+    w("</section>\n")
+
+    w("<section>\n")
+    w("<h2>Extraction Summary</h2>\n")
+    _kv_table(w, workbook.summary)
+    w("</section>\n")
+    yield buf.getvalue()
+
+    fragments = _CellFragments.build(workbook.style_css_map)
+    if workers is not None and workers > 1 and len(workbook.sheets) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(workbook.sheets))) as pool:
+            yield from pool.map(_sheet_html, workbook.sheets, repeat(fragments))
+    else:
+        for sheet in workbook.sheets:
+            yield _sheet_html(sheet, fragments)
 
-def render_workbook_html(workbook: WorkbookDoc) -> str:
-    parts: list[str] = []
-
-    parts.append("<!doctype html>")
-    parts.append('<html lang="ja">')
-    parts.append("<head>")
-    parts.append('<meta charset="utf-8">')
-    parts.append('<meta name="viewport" content="width=device-width, initial-scale=1">')
-    parts.append(f"<title>{html_escape(workbook.source_path.name)} - SheetView HTML</title>")
-    parts.append(_html_css())
-    parts.append("</head>")
-    parts.append("<body>")
-
-    parts.append('<main class="page">')
-    parts.append(f"<h1>Workbook: {html_escape(workbook.source_path.name)}</h1>")
-
-    parts.append("<section>")
-    parts.append("<h2>Source Metadata</h2>")
-    parts.append(_kv_table(workbook.source_metadata))
-    parts.append("</section>")
-
-    parts.append("<section>")
-    parts.append("<h2>Extraction Summary</h2>")
-    parts.append(_kv_table(workbook.summary))
-    parts.append("</section>")
-
-    for sheet in workbook.sheets:
-        parts.append('<section class="sheet">')
-        parts.append(f"<h2>Sheet: {html_escape(sheet.name)} [{html_escape(sheet.state)}]</h2>")
-        print_areas = ", ".join(r.ref for r in sheet.print_areas) if sheet.print_areas else "(none)"
-        parts.append(
-            "<p class=\"meta\">"
-            f"used_range=<code>{html_escape(sheet.dimension_ref)}</code> / "
-            f"print_areas=<code>{html_escape(print_areas)}</code> / "
-            f"hidden_rows=<code>{len(sheet.hidden_rows)}</code> / "
-            f"hidden_cols=<code>{len(sheet.hidden_cols)}</code>"
-            "</p>"
-        )
-        if sheet.pane:
-            parts.append(f"<p class=\"meta\">pane=<code>{html_escape(json.dumps(sheet.pane, ensure_ascii=False))}</code></p>")
-
-        ranges = _sheetview_ranges(sheet)
-        for idx, rng in enumerate(ranges, start=1):
-            parts.append(f"<h3>Range {idx}: {html_escape(rng.ref)}</h3>")
-            parts.append(_render_sheet_range_html(sheet, rng.ref, workbook.style_css_map, idx))
-
-        if not ranges:
-            parts.append('<p class="empty">No renderable range.</p>')
-
-        if sheet.unsupported:
-            parts.append("<details>")
-            parts.append(f"<summary>Unsupported Elements ({len(sheet.unsupported)})</summary>")
-            parts.append('<table class="simple">')
-            parts.append("<thead><tr><th>scope</th><th>location</th><th>tag</th></tr></thead><tbody>")
-            for item in sheet.unsupported:
-                parts.append(
-                    "<tr>"
-                    f"<td>{html_escape(item.scope)}</td>"
-                    f"<td>{html_escape(item.location)}</td>"
-                    f"<td>{html_escape(item.tag)}</td>"
-                    "</tr>"
-                )
-            parts.append("</tbody></table>")
-            parts.append("</details>")
-
-        parts.append("</section>")
-
-    parts.append("<section>")
-    parts.append("<h2>Warnings</h2>")
+    buf = io.StringIO()
+    w = buf.write
+    w("<section>\n")
+    w("<h2>Warnings</h2>\n")
     if not workbook.warnings:
-        parts.append("<p>(none)</p>")
+        w("<p>(none)</p>\n")
     else:
-        parts.append("<ul>")
+        w("<ul>\n")
         for warning in workbook.warnings:
-            parts.append(f"<li>{html_escape(warning)}</li>")
-        parts.append("</ul>")
-    parts.append("</section>")
+            w(f"<li>{html_escape(warning)}</li>\n")
+        w("</ul>\n")
+    w("</section>\n")
+
+    w(_DOC_TAIL)
+    yield buf.getvalue()
+
+
+def _sheet_html(sheet: SheetDoc, fragments: _CellFragments) -> str:
+    buf = io.StringIO()
+    _render_sheet_html(buf.write, sheet, fragments)
+    return buf.getvalue()
+
+
+def _render_sheet_html(w: Callable[[str], object], sheet: SheetDoc, fragments: _CellFragments) -> None:
+    w('<section class="sheet">\n')
+    w(f"<h2>Sheet: {html_escape(sheet.name)} [{html_escape(sheet.state)}]</h2>\n")
+    print_areas = ", ".join(r.ref for r in sheet.print_areas) if sheet.print_areas else "(none)"
+    w(
+        "<p class=\"meta\">"
+        f"used_range=<code>{html_escape(sheet.dimension_ref)}</code> / "
+        f"print_areas=<code>{html_escape(print_areas)}</code> / "
+        f"hidden_rows=<code>{len(sheet.hidden_rows)}</code> / "
+        f"hidden_cols=<code>{len(sheet.hidden_cols)}</code>"
+        "</p>\n"
+    )
+    if sheet.pane:
+        w(f"<p class=\"meta\">pane=<code>{html_escape(json.dumps(sheet.pane, ensure_ascii=False))}</code></p>\n")
+
+    ranges = sheetview_ranges(sheet)
+    for idx, rng in enumerate(ranges, start=1):
+        w(f"<h3>Range {idx}: {html_escape(rng.ref)}</h3>\n")
+        _render_sheet_range_html(w, sheet, rng.ref, fragments, idx)
+
+    if not ranges:
+        w('<p class="empty">No renderable range.</p>\n')
+
+    if sheet.unsupported:
+        w("<details>\n")
+        w(f"<summary>Unsupported Elements ({len(sheet.unsupported)})</summary>\n")
+        w('<table class="simple">\n')
+        w("<thead><tr><th>scope</th><th>location</th><th>tag</th></tr></thead><tbody>\n")
+        for item in sheet.unsupported:
+            w(
+                "<tr>"
+                f"<td>{html_escape(item.scope)}</td>"
+                f"<td>{html_escape(item.location)}</td>"
+                f"<td>{html_escape(item.tag)}</td>"
+                "</tr>\n"
+            )
+        w("</tbody></table>\n")
+        w("</details>\n")
 
-    parts.append("</main>")
-    parts.append("</body>")
-    parts.append("</html>")
+    w("</section>\n")
 
-    return "\n".join(parts) + "\n"
 
-
-def _sheetview_ranges(sheet: SheetDoc):
-    if sheet.print_areas:
-        return sheet.print_areas
-    try:
-        return [parse_range_ref(sheet.dimension_ref)]
-    except ValueError:
-        return []
+def _shown_mask(start: int, end: int, hidden: set[int]) -> bytearray:
+    shown = bytearray(b"\x01") * (end - start + 1)
+    for index in hidden:
+        shown[index - start] = 0
+    return shown
 
 
 @dataclass(slots=True)
@@ -112,67 +159,172 @@ class _SheetGeometry:
     sheet: SheetDoc
     start_col: int
     start_row: int
+    end_col: int
+    end_row: int
     visible_cols: list[int]
     visible_rows: list[int]
     total_width: float
     total_height: float
+    col_prefix: array[float]
+    row_prefix: array[float]
+    col_px: dict[int, float]
+    row_px: dict[int, float]
+    col_back: array[float]
+    row_back: array[float]
 
     @classmethod
     def build(cls, sheet: SheetDoc, start_col: int, start_row: int, end_col: int, end_row: int) -> "_SheetGeometry":
-        visible_cols = [c for c in range(start_col, end_col + 1) if c not in sheet.hidden_cols]
-        visible_rows = [r for r in range(start_row, end_row + 1) if r not in sheet.hidden_rows]
+        col_widths = sheet.col_widths
+        row_heights = sheet.row_heights
+        col_px = dict.fromkeys(range(start_col, end_col + 1), _col_width_to_px(None))
+        row_px = dict.fromkeys(range(start_row, end_row + 1), _row_height_to_px(None))
+        for c, width in col_widths.items():
+            if start_col <= c <= end_col:
+                col_px[c] = _col_width_to_px(width)
+        for r, height in row_heights.items():
+            if start_row <= r <= end_row:
+                row_px[r] = _row_height_to_px(height)
+        hidden_cols = {c for c in sheet.hidden_cols if start_col <= c <= end_col}
+        hidden_rows = {r for r in sheet.hidden_rows if start_row <= r <= end_row}
+        if hidden_cols:
+            shown_cols = _shown_mask(start_col, end_col, hidden_cols)
+            visible_cols = list(compress(range(start_col, end_col + 1), shown_cols))
+            col_steps = map(mul, col_px.values(), shown_cols)
+        else:
+            visible_cols = list(range(start_col, end_col + 1))
+            col_steps = col_px.values()
+        if hidden_rows:
+            shown_rows = _shown_mask(start_row, end_row, hidden_rows)
+            visible_rows = list(compress(range(start_row, end_row + 1), shown_rows))
+            row_steps = map(mul, row_px.values(), shown_rows)
+        else:
+            visible_rows = list(range(start_row, end_row + 1))
+            row_steps = row_px.values()
 
-        total_w = sum(_col_width_to_px(sheet.col_widths.get(c)) for c in visible_cols)
-        total_h = sum(_row_height_to_px(sheet.row_heights.get(r)) for r in visible_rows)
-        return cls(
+        total_w = sum(map(col_px.__getitem__, visible_cols))
+        total_h = sum(map(row_px.__getitem__, visible_rows))
+        geom = cls(
             sheet=sheet,
             start_col=start_col,
             start_row=start_row,
+            end_col=end_col,
+            end_row=end_row,
             visible_cols=visible_cols,
             visible_rows=visible_rows,
             total_width=total_w,
             total_height=total_h,
+            col_prefix=array("d", accumulate(col_steps, initial=0.0)),
+            row_prefix=array("d", accumulate(row_steps, initial=0.0)),
+            col_px=col_px,
+            row_px=row_px,
+            col_back=array("d", [0.0]),
+            row_back=array("d", [0.0]),
         )
+        return geom
 
     def col_width(self, col: int) -> float:
-        return _col_width_to_px(self.sheet.col_widths.get(col))
+        px = self.col_px.get(col)
+        if px is None:
+            px = self.col_px[col] = _col_width_to_px(self.sheet.col_widths.get(col))
+        return px
 
     def row_height(self, row: int) -> float:
-        return _row_height_to_px(self.sheet.row_heights.get(row))
+        px = self.row_px.get(row)
+        if px is None:
+            px = self.row_px[row] = _row_height_to_px(self.sheet.row_heights.get(row))
+        return px
+
+    def _extend_col_prefix(self, col: int) -> None:
+        prefix = self.col_prefix
+        hidden = self.sheet.hidden_cols
+        x = prefix[-1]
+        for c in range(self.start_col + len(prefix) - 1, col):
+            if c not in hidden:
+                x += self.col_width(c)
+            prefix.append(x)
+
+    def _extend_row_prefix(self, row: int) -> None:
+        prefix = self.row_prefix
+        hidden = self.sheet.hidden_rows
+        y = prefix[-1]
+        for r in range(self.start_row + len(prefix) - 1, row):
+            if r not in hidden:
+                y += self.row_height(r)
+            prefix.append(y)
+
+    def _extend_col_back(self, col: int) -> None:
+        back = self.col_back
+        hidden = self.sheet.hidden_cols
+        x = back[-1]
+        for c in range(self.start_col - len(back), col - 1, -1):
+            if c not in hidden:
+                x += self.col_width(c)
+            back.append(x)
+
+    def _extend_row_back(self, row: int) -> None:
+        back = self.row_back
+        hidden = self.sheet.hidden_rows
+        y = back[-1]
+        for r in range(self.start_row - len(back), row - 1, -1):
+            if r not in hidden:
+                y += self.row_height(r)
+            back.append(y)
 
     def x_at_col(self, col: int, col_off: int = 0) -> float:
-        x = 0.0
         if col >= self.start_col:
-            for c in range(self.start_col, col):
-                if c in self.sheet.hidden_cols:
-                    continue
-                x += self.col_width(c)
+            idx = col - self.start_col
+            if idx >= len(self.col_prefix):
+                self._extend_col_prefix(col)
+            x = self.col_prefix[idx]
         else:
-            for c in range(col, self.start_col):
-                if c in self.sheet.hidden_cols:
-                    continue
-                x -= self.col_width(c)
-        x += col_off / EMU_PER_PIXEL
-        return x
+            idx = self.start_col - col
+            if idx >= len(self.col_back):
+                self._extend_col_back(col)
+            x = -self.col_back[idx]
+        return x + col_off / EMU_PER_PIXEL
 
     def y_at_row(self, row: int, row_off: int = 0) -> float:
-        y = 0.0
         if row >= self.start_row:
-            for r in range(self.start_row, row):
-                if r in self.sheet.hidden_rows:
-                    continue
-                y += self.row_height(r)
+            idx = row - self.start_row
+            if idx >= len(self.row_prefix):
+                self._extend_row_prefix(row)
+            y = self.row_prefix[idx]
         else:
-            for r in range(row, self.start_row):
-                if r in self.sheet.hidden_rows:
-                    continue
-                y -= self.row_height(r)
-        y += row_off / EMU_PER_PIXEL
-        return y
+            idx = self.start_row - row
+            if idx >= len(self.row_back):
+                self._extend_row_back(row)
+            y = -self.row_back[idx]
+        return y + row_off / EMU_PER_PIXEL
 
     def point(self, anchor: AnchorPoint) -> tuple[float, float]:
         return self.x_at_col(anchor.col, anchor.col_off), self.y_at_row(anchor.row, anchor.row_off)
 
+    def points(self, anchors: list[AnchorPoint | None]) -> list[tuple[float, float] | None]:
+        present = [a for a in anchors if a is not None]
+        if not present:
+            return [None] * len(anchors)
+        self._extend_col_prefix(max(a.col for a in present) + 1)
+        self._extend_row_prefix(max(a.row for a in present) + 1)
+
+        start_col = self.start_col
+        start_row = self.start_row
+        col_prefix = self.col_prefix
+        row_prefix = self.row_prefix
+        out: list[tuple[float, float] | None] = []
+        for a in anchors:
+            if a is None:
+                out.append(None)
+            elif a.col >= start_col and a.row >= start_row:
+                out.append(
+                    (
+                        col_prefix[a.col - start_col] + a.col_off / EMU_PER_PIXEL,
+                        row_prefix[a.row - start_row] + a.row_off / EMU_PER_PIXEL,
+                    )
+                )
+            else:
+                out.append(self.point(a))
+        return out
+
     def freeze_lines(self) -> tuple[float | None, float | None]:
         if not self.sheet.pane:
             return None, None
@@ -200,126 +352,215 @@ class _SheetGeometry:
         return freeze_x, freeze_y
 
 
-def _render_sheet_range_html(sheet: SheetDoc, range_ref: str, style_css_map: dict[str, str], idx: int) -> str:
+def _render_sheet_range_html(
+    w: Callable[[str], object],
+    sheet: SheetDoc,
+    range_ref: str,
+    fragments: _CellFragments,
+    idx: int,
+) -> None:
     rng = parse_range_ref(range_ref)
     geom = _SheetGeometry.build(sheet, rng.start_col, rng.start_row, rng.end_col, rng.end_row)
 
     if not geom.visible_rows or not geom.visible_cols:
-        return '<p class="empty">All rows/cols in this range are hidden.</p>'
+        w('<p class="empty">All rows/cols in this range are hidden.</p>\n')
+        return
 
-    merge_anchor: dict[str, tuple[int, int, str]] = {}
-    merge_covered: set[str] = set()
+    merge_anchor: dict[int, tuple[int, int, str]] = {}
+    merge_covered: set[int] = set()
+    visible_rows = geom.visible_rows
+    visible_cols = geom.visible_cols
     for m in sheet.merges:
         if m.end_row < rng.start_row or m.start_row > rng.end_row:
             continue
         if m.end_col < rng.start_col or m.start_col > rng.end_col:
             continue
 
-        m_rows = [r for r in geom.visible_rows if m.start_row <= r <= m.end_row]
-        m_cols = [c for c in geom.visible_cols if m.start_col <= c <= m.end_col]
+        m_rows = visible_rows[bisect_left(visible_rows, m.start_row) : bisect_right(visible_rows, m.end_row)]
+        m_cols = visible_cols[bisect_left(visible_cols, m.start_col) : bisect_right(visible_cols, m.end_col)]
         if not m_rows or not m_cols:
             continue
 
-        anchor_coord = rowcol_to_coord(m_rows[0], m_cols[0])
-        merge_anchor[anchor_coord] = (len(m_rows), len(m_cols), m.ref)
+        anchor_key = (m_rows[0] << _COORD_SHIFT) | m_cols[0]
+        merge_anchor[anchor_key] = (len(m_rows), len(m_cols), m.ref)
         for rr in m_rows:
-            for cc in m_cols:
-                coord = rowcol_to_coord(rr, cc)
-                if coord != anchor_coord:
-                    merge_covered.add(coord)
+            base = rr << _COORD_SHIFT
+            merge_covered.update(base | cc for cc in m_cols)
+        merge_covered.discard(anchor_key)
 
-    out: list[str] = []
-    out.append(f'<div class="sv-range" data-range-id="{idx}">')
+    w(f'<div class="sv-range" data-range-id="{idx}">\n')
     pad_top, pad_right, pad_bottom, pad_left = _sheet_padding_px(sheet)
-    out.append('<div class="sv-wrap">')
-    out.append(
+    w('<div class="sv-wrap">\n')
+    w(
         '<div class="sv-viewport" '
-        f'style="padding:{pad_top:.1f}px {pad_right:.1f}px {pad_bottom:.1f}px {pad_left:.1f}px;">'
+        f'style="padding:{pad_top:.1f}px {pad_right:.1f}px {pad_bottom:.1f}px {pad_left:.1f}px;">\n'
     )
-    out.append('<div class="sv-canvas">')
-    out.append('<table class="sv-grid">')
-    out.append("<colgroup>")
-    out.append(f'<col style="width:{ROW_HEADER_WIDTH}px">')
-    for col in geom.visible_cols:
-        out.append(f'<col style="width:{geom.col_width(col):.1f}px">')
-    out.append("</colgroup>")
-    out.append("<thead>")
-    out.append('<tr class="sv-head-row">')
-    out.append('<th class="sv-corner"></th>')
-    for col in geom.visible_cols:
-        out.append(f'<th class="sv-col-head">{index_to_col(col)}</th>')
-    out.append("</tr>")
-    out.append("</thead>")
-    out.append("<tbody>")
-
-    for row in geom.visible_rows:
-        out.append(f'<tr style="height:{geom.row_height(row):.1f}px">')
-        out.append(f'<th class="sv-row-head">{row}</th>')
-        for col in geom.visible_cols:
-            coord = rowcol_to_coord(row, col)
-            if coord in merge_covered:
-                continue
-
-            cell = sheet.cell_map.get(coord)
-            style_id = cell.style_id if cell and cell.style_id is not None else "0"
-            style_css = style_css_map.get(style_id, "")
-            if style_css and not style_css.strip().endswith(";"):
-                style_css += ";"
-
-            attrs: list[str] = []
-            if coord in merge_anchor:
-                rowspan, colspan, merge_ref = merge_anchor[coord]
-                attrs.append(f'rowspan="{rowspan}"')
-                attrs.append(f'colspan="{colspan}"')
-                attrs.append(f'data-merge="{html_escape(merge_ref)}"')
-
-            text_html = _cell_html(cell.display_value if cell else "")
-            classes = ["sv-cell"]
-            if not text_html.strip():
-                classes.append("sv-empty")
-            attrs.append(f'class="{" ".join(classes)}"')
-            attrs.append(f'data-coord="{coord}"')
-            if style_css:
-                attrs.append(f'style="{html_escape(style_css)}"')
-
-            out.append(f"<td {' '.join(attrs)}>{text_html}</td>")
-        out.append("</tr>")
-
-    out.append("</tbody>")
-    out.append("</table>")
-    out.extend(_overlay_html(sheet, geom))
-    out.append("</div>")
-    out.append("</div>")
+    w('<div class="sv-canvas">\n')
+    w('<table class="sv-grid">\n')
+    w("<colgroup>\n")
+    w(f'<col style="width:{ROW_HEADER_WIDTH}px">\n')
+    col_px = geom.col_px
+    col_tags = {width: f'<col style="width:{width:.1f}px">\n' for width in {col_px[col] for col in geom.visible_cols}}
+    w("".join([col_tags[col_px[col]] for col in geom.visible_cols]))
+    w("</colgroup>\n")
+    w("<thead>\n")
+    w('<tr class="sv-head-row">\n')
+    w('<th class="sv-corner"></th>\n')
+    col_labels = [index_to_col(col) for col in geom.visible_cols]
+    w("".join([f'<th class="sv-col-head">{label}</th>\n' for label in col_labels]))
+    w("</tr>\n")
+    w("</thead>\n")
+    w("<tbody>\n")
+
+    _render_body_rows(w, sheet, geom, col_labels, fragments, merge_anchor, merge_covered)
+
+    w("</tbody>\n")
+    w("</table>\n")
+    _overlay_html(w, sheet, geom)
+    w("</div>\n")
+    w("</div>\n")
     hf_html = _header_footer_html(sheet)
     if hf_html:
-        out.append(hf_html)
-    out.append("</div>")
-    out.append("</div>")
-    return "\n".join(out)
+        w(hf_html)
+        w("\n")
+    w("</div>\n")
+    w("</div>\n")
 
 
-def _overlay_html(sheet: SheetDoc, geom: _SheetGeometry) -> list[str]:
-    drawing_map = {obj.object_uid: obj for obj in sheet.drawings}
+@dataclass(slots=True)
+class _CellFragments:
+    style_attrs: dict[str, str]
+    empty: tuple[str, str]
 
-    lines: list[str] = []
-    lines.append('<div class="sv-overlay">')
+    @classmethod
+    def build(cls, style_css_map: dict[str, str]) -> "_CellFragments":
+        style_attrs = build_style_attrs(style_css_map)
+        empty = ('class="sv-cell sv-empty" data-coord="', f'"{style_attrs.get("0", "")}></td>\n')
+        return cls(style_attrs=style_attrs, empty=empty)
+
+    def make(self, value: str, style_id: str) -> tuple[str, str]:
+        # Each cell becomes the fragments around its column label: the opening
+        # class/data-coord attributes and the closing style/body/</td>.
+        if value and not value.isspace():
+            text_html = html_escape(value)
+            cls = "sv-cell"
+        else:
+            text_html = value
+            cls = "sv-cell sv-empty"
+        return (
+            f'class="{cls}" data-coord="',
+            f'"{self.style_attrs.get(style_id, "")}>{text_html}</td>\n',
+        )
 
-    z = 10
-    for obj in sheet.drawings:
-        if obj.kind == "cxnSp":
+
+def _render_body_rows(
+    w: Callable[[str], object],
+    sheet: SheetDoc,
+    geom: _SheetGeometry,
+    col_labels: list[str],
+    fragments: _CellFragments,
+    merge_anchor: dict[int, tuple[int, int, str]],
+    merge_covered: set[int],
+) -> None:
+    visible_cols = geom.visible_cols
+    visible_rows = geom.visible_rows
+    row_height = geom.row_height
+    escape = html_escape
+
+    min_row, max_row = visible_rows[0], visible_rows[-1]
+    min_col, max_col = visible_cols[0], visible_cols[-1]
+    cell_info: dict[int, tuple[str, str]] = {}
+    # Per-range memo: numeric and ID-like cells rarely repeat, so it is not kept across ranges.
+    cache: dict[tuple[str, str], tuple[str, str]] = {}
+    for (r, c), cell in sheet.cell_rc_map.items():
+        if r < min_row or r > max_row or c < min_col or c > max_col:
             continue
+        value = cell.display_value
+        style_id = cell.style_id if cell.style_id is not None else "0"
+        info = cache.get((value, style_id))
+        if info is None:
+            info = cache[(value, style_id)] = fragments.make(value, style_id)
+        cell_info[(r << _COORD_SHIFT) | c] = info
+
+    # Rows are kept as static segments joined by the row number, so rows with
+    # the same height and cells (blank stretches, repeated blocks) share one build.
+    merge_rows = {key >> _COORD_SHIFT for key in merge_covered}
+    merge_rows.update(key >> _COORD_SHIFT for key in merge_anchor)
+    empty_info = fragments.empty
+    tr_open: dict[float, str] = {}
+    row_cache: dict[tuple, list[str]] = {}
+    for row in visible_rows:
+        height = row_height(row)
+        row_key = row << _COORD_SHIFT
+        infos = tuple([cell_info.get(row_key | col, empty_info) for col in visible_cols])
+        cacheable = row not in merge_rows
+        if cacheable:
+            segments = row_cache.get((height, infos))
+            if segments is not None:
+                w(str(row).join(segments))
+                continue
+
+        opener = tr_open.get(height)
+        if opener is None:
+            opener = tr_open[height] = f'<tr style="height:{height:.1f}px">\n<th class="sv-row-head">'
+        segments = [opener]
+        append = segments.append
+        tail = "</th>\n"
+        if cacheable:
+            for label, (cell_open, cell_close) in zip(col_labels, infos):
+                append(f"{tail}<td {cell_open}{label}")
+                tail = cell_close
+        else:
+            for col, label, (cell_open, cell_close) in zip(visible_cols, col_labels, infos):
+                key = row_key | col
+                if key in merge_covered:
+                    continue
 
-        rect = _shape_rect(obj, geom)
+                merge = merge_anchor.get(key)
+                if merge is not None:
+                    rowspan, colspan, merge_ref = merge
+                    merge_attrs = f'rowspan="{rowspan}" colspan="{colspan}" data-merge="{escape(merge_ref)}" '
+                else:
+                    merge_attrs = ""
+
+                append(f"{tail}<td {merge_attrs}{cell_open}{label}")
+                tail = cell_close
+        append(f"{tail}</tr>\n")
+
+        if cacheable and len(row_cache) < _ROW_CACHE_LIMIT:
+            row_cache[(height, infos)] = segments
+        w(str(row).join(segments))
+
+
+def _overlay_html(w: Callable[[str], object], sheet: SheetDoc, geom: _SheetGeometry) -> None:
+    row_breaks = sheet.page_breaks.get("row", [])
+    col_breaks = sheet.page_breaks.get("col", [])
+    if not sheet.drawings and not sheet.connectors and not sheet.pane and not row_breaks and not col_breaks:
+        w('<div class="sv-overlay"></div>\n')
+        return
+
+    escape = html_escape
+    total_w = geom.total_width
+    total_h = geom.total_height
+
+    w('<div class="sv-overlay">\n')
+
+    shapes = [obj for obj in sheet.drawings if obj.kind != "cxnSp" and not _anchors_outside(obj, geom)]
+    shape_points = geom.points([a for obj in shapes for a in (obj.anchor_from, obj.anchor_to)])
+
+    z = 10
+    for i, obj in enumerate(shapes):
+        rect = _shape_rect(obj, shape_points[2 * i], shape_points[2 * i + 1])
         if rect is None:
             continue
         left, top, width, height = rect
         if left + width < 0 or top + height < 0:
             continue
-        if left > geom.total_width or top > geom.total_height:
+        if left > total_w or top > total_h:
             continue
 
         label = (obj.text or obj.name or obj.object_id).strip()
-        safe_label = html_escape(label)
+        safe_label = escape(label)
 
         classes = ["sv-shape"]
         if obj.kind == "pic":
@@ -336,74 +577,103 @@ def _overlay_html(sheet: SheetDoc, geom: _SheetGeometry) -> list[str]:
         else:
             body = safe_label or "&nbsp;"
 
-        lines.append(
+        w(
             f'<div class="{" ".join(classes)}" style="left:{left:.1f}px;top:{top:.1f}px;'
-            f'width:{width:.1f}px;height:{height:.1f}px;{shape_style}">{body}</div>'
+            f'width:{width:.1f}px;height:{height:.1f}px;{shape_style}">{body}</div>\n'
         )
 
-    lines.append(
-        f'<svg class="sv-lines" width="{geom.total_width:.1f}" height="{geom.total_height:.1f}" '
-        f'viewBox="0 0 {geom.total_width:.1f} {geom.total_height:.1f}">'
-    )
-    lines.append("<defs>")
-    lines.append('<marker id="arrow-triangle" viewBox="0 0 10 10" refX="8" refY="5" markerWidth="7" markerHeight="7" orient="auto-start-reverse">')
-    lines.append('<path d="M 0 0 L 10 5 L 0 10 z" fill="context-stroke" />')
-    lines.append("</marker>")
-    lines.append("</defs>")
-
-    for conn in sheet.connectors:
-        p1, p2 = _connector_points(conn.anchor_from, conn.anchor_to, conn.bbox, geom)
+    freeze_x, freeze_y = geom.freeze_lines()
+    if not sheet.connectors and freeze_x is None and freeze_y is None and not row_breaks and not col_breaks:
+        w("</div>\n")
+        return
+
+    tw = f"{total_w:.1f}"
+    th = f"{total_h:.1f}"
+    w(f'<svg class="sv-lines" width="{tw}" height="{th}" viewBox="0 0 {tw} {th}">\n')
+    w("<defs>\n")
+    w('<marker id="arrow-triangle" viewBox="0 0 10 10" refX="8" refY="5" markerWidth="7" markerHeight="7" orient="auto-start-reverse">\n')
+    w('<path d="M 0 0 L 10 5 L 0 10 z" fill="context-stroke" />\n')
+    w("</marker>\n")
+    w("</defs>\n")
+
+    connectors = [conn for conn in sheet.connectors if not _anchors_outside(conn, geom)]
+    drawing_map = {obj.object_uid: obj for obj in sheet.drawings} if connectors else {}
+    conn_points = geom.points([a for conn in connectors for a in (conn.anchor_from, conn.anchor_to)])
+    for i, conn in enumerate(connectors):
+        p1, p2 = _connector_points(conn_points[2 * i], conn_points[2 * i + 1], conn.bbox)
         x1, y1 = p1
         x2, y2 = p2
 
-        if max(x1, x2) < 0 or max(y1, y2) < 0 or min(x1, x2) > geom.total_width or min(y1, y2) > geom.total_height:
+        if max(x1, x2) < 0 or max(y1, y2) < 0 or min(x1, x2) > total_w or min(y1, y2) > total_h:
             continue
 
         source_obj = drawing_map.get(conn.object_uid)
         extra = source_obj.extra if source_obj else {}
         stroke = extra.get("line_color", "#ef4444")
         stroke_width = extra.get("line_width_px", "1.2")
-        dash = extra.get("line_dash", "")
-        dash_css = _dasharray_for(dash)
+        dash_attr = _DASHARRAY_ATTRS.get(extra.get("line_dash", ""), "")
         marker_start = ' marker-start="url(#arrow-triangle)"' if _has_arrow(conn.arrow_head) else ""
         marker_end = ' marker-end="url(#arrow-triangle)"' if _has_arrow(conn.arrow_tail) else ""
-        dash_attr = f' stroke-dasharray="{dash_css}"' if dash_css else ""
 
-        lines.append(
+        w(
             f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
-            f'stroke="{stroke}" stroke-width="{stroke_width}" stroke-opacity="0.92"{dash_attr}{marker_start}{marker_end} />'
+            f'stroke="{stroke}" stroke-width="{stroke_width}" stroke-opacity="0.92"{dash_attr}{marker_start}{marker_end} />\n'
         )
 
         if conn.text:
             mx = (x1 + x2) / 2
             my = (y1 + y2) / 2
-            label = html_escape(conn.text.strip())
-            lines.append(f'<text x="{mx:.1f}" y="{my - 2:.1f}" class="sv-line-label">{label}</text>')
+            label = escape(conn.text.strip())
+            w(f'<text x="{mx:.1f}" y="{my - 2:.1f}" class="sv-line-label">{label}</text>\n')
 
-    freeze_x, freeze_y = geom.freeze_lines()
     if freeze_x is not None:
-        lines.append(f'<line class="sv-freeze" x1="{freeze_x:.1f}" y1="0" x2="{freeze_x:.1f}" y2="{geom.total_height:.1f}" />')
+        w(f'<line class="sv-freeze" x1="{freeze_x:.1f}" y1="0" x2="{freeze_x:.1f}" y2="{th}" />\n')
     if freeze_y is not None:
-        lines.append(f'<line class="sv-freeze" x1="0" y1="{freeze_y:.1f}" x2="{geom.total_width:.1f}" y2="{freeze_y:.1f}" />')
-
-    for row_break in sheet.page_breaks.get("row", []):
-        y = geom.y_at_row(row_break + 1)
-        if 0 <= y <= geom.total_height:
-            lines.append(f'<line class="sv-page-break" x1="0" y1="{y:.1f}" x2="{geom.total_width:.1f}" y2="{y:.1f}" />')
-    for col_break in sheet.page_breaks.get("col", []):
-        x = geom.x_at_col(col_break + 1)
-        if 0 <= x <= geom.total_width:
-            lines.append(f'<line class="sv-page-break" x1="{x:.1f}" y1="0" x2="{x:.1f}" y2="{geom.total_height:.1f}" />')
-
-    lines.append("</svg>")
-    lines.append("</div>")
-    return lines
-
-
-def _shape_rect(obj, geom: _SheetGeometry) -> tuple[float, float, float, float] | None:
-    if obj.anchor_from is not None and obj.anchor_to is not None:
-        x1, y1 = geom.point(obj.anchor_from)
-        x2, y2 = geom.point(obj.anchor_to)
+        w(f'<line class="sv-freeze" x1="0" y1="{freeze_y:.1f}" x2="{tw}" y2="{freeze_y:.1f}" />\n')
+
+    y_at_row = geom.y_at_row
+    for row_break in row_breaks:
+        y = y_at_row(row_break + 1)
+        if 0 <= y <= total_h:
+            w(f'<line class="sv-page-break" x1="0" y1="{y:.1f}" x2="{tw}" y2="{y:.1f}" />\n')
+    x_at_col = geom.x_at_col
+    for col_break in col_breaks:
+        x = x_at_col(col_break + 1)
+        if 0 <= x <= total_w:
+            w(f'<line class="sv-page-break" x1="{x:.1f}" y1="0" x2="{x:.1f}" y2="{th}" />\n')
+
+    w("</svg>\n")
+    w("</div>\n")
+
+
+def _anchors_outside(obj, geom: _SheetGeometry) -> bool:
+    start, end = obj.anchor_from, obj.anchor_to
+    if start is None or end is None:
+        return False
+    # Only reject anchors lying past a whole visible column/row beyond the range;
+    # anything closer can still touch the canvas edge and is left to the pixel checks.
+    hidden_cols = geom.sheet.hidden_cols
+    hidden_rows = geom.sheet.hidden_rows
+    before_col = geom.start_col - 1
+    after_col = geom.end_col + 1
+    before_row = geom.start_row - 1
+    after_row = geom.end_row + 1
+    return (
+        (max(start.col, end.col) < before_col and before_col not in hidden_cols)
+        or (min(start.col, end.col) > after_col and after_col not in hidden_cols)
+        or (max(start.row, end.row) < before_row and before_row not in hidden_rows)
+        or (min(start.row, end.row) > after_row and after_row not in hidden_rows)
+    )
+
+
+def _shape_rect(
+    obj,
+    from_point: tuple[float, float] | None,
+    to_point: tuple[float, float] | None,
+) -> tuple[float, float, float, float] | None:
+    if from_point is not None and to_point is not None:
+        x1, y1 = from_point
+        x2, y2 = to_point
         left = min(x1, x2)
         top = min(y1, y2)
         width = max(8.0, abs(x2 - x1))
@@ -417,35 +687,36 @@ def _shape_rect(obj, geom: _SheetGeometry) -> tuple[float, float, float, float]
 
 
 def _connector_points(
-    from_anchor: AnchorPoint | None,
-    to_anchor: AnchorPoint | None,
+    from_point: tuple[float, float] | None,
+    to_point: tuple[float, float] | None,
     bbox: tuple[float, float, float, float],
-    geom: _SheetGeometry,
 ) -> tuple[tuple[float, float], tuple[float, float]]:
-    if from_anchor is not None:
-        p1 = geom.point(from_anchor)
-    else:
-        p1 = (bbox[0], bbox[1])
-
-    if to_anchor is not None:
-        p2 = geom.point(to_anchor)
-    else:
-        p2 = (bbox[2], bbox[3])
-
+    p1 = from_point if from_point is not None else (bbox[0], bbox[1])
+    p2 = to_point if to_point is not None else (bbox[2], bbox[3])
     return p1, p2
 
 
 def _shape_style_css(extra: dict[str, str], z_index: int) -> str:
-    line = (extra.get("line_color") or "").strip()
-    fill = (extra.get("fill_color") or "").strip()
-    width_raw = (extra.get("line_width_px") or "1.0").strip()
-    dash = extra.get("line_dash")
+    core = _shape_style_core(
+        extra.get("line_color"),
+        extra.get("fill_color"),
+        extra.get("line_width_px"),
+        extra.get("line_dash"),
+    )
+    return f"z-index:{z_index};{core}"
+
+
+@lru_cache(maxsize=256)
+def _shape_style_core(line: str | None, fill: str | None, width_raw: str | None, dash: str | None) -> str:
+    line = (line or "").strip()
+    fill = (fill or "").strip()
+    width_raw = (width_raw or "1.0").strip()
     try:
         width = max(0.5, float(width_raw))
     except ValueError:
         width = 1.0
 
-    pieces = [f"z-index:{z_index}"]
+    pieces: list[str] = []
     if line:
         pieces.append(f"border-color:{line}")
         pieces.append(f"border-width:{width:.2f}px")
@@ -461,6 +732,7 @@ def _shape_style_css(extra: dict[str, str], z_index: int) -> str:
     return ";".join(pieces) + ";"
 
 
+@lru_cache(maxsize=256)
 def _to_alpha(color: str, alpha: float) -> str:
     c = color.strip()
     if c.startswith("#") and len(c) == 7:
@@ -474,36 +746,32 @@ def _to_alpha(color: str, alpha: float) -> str:
     return c
 
 
-def _border_style_for_dash(dash: str) -> str:
-    mapping = {
-        "dash": "dashed",
-        "dot": "dotted",
-        "dashDot": "dashed",
-        "lgDash": "dashed",
-    }
-    return mapping.get(dash, "solid")
+_DASH_BORDER_STYLES = {
+    "dash": "dashed",
+    "dot": "dotted",
+    "dashDot": "dashed",
+    "lgDash": "dashed",
+}
 
+_DASHARRAYS = {
+    "dash": "6 4",
+    "dot": "2 3",
+    "dashDot": "8 3 2 3",
+    "lgDash": "10 4",
+    "sysDot": "2 3",
+    "sysDash": "6 4",
+}
+_DASHARRAY_ATTRS = {dash: f' stroke-dasharray="{css}"' for dash, css in _DASHARRAYS.items()}
 
-def _dasharray_for(dash: str) -> str:
-    mapping = {
-        "dash": "6 4",
-        "dot": "2 3",
-        "dashDot": "8 3 2 3",
-        "lgDash": "10 4",
-        "sysDot": "2 3",
-        "sysDash": "6 4",
-    }
-    return mapping.get(dash, "")
+
+def _border_style_for_dash(dash: str) -> str:
+    return _DASH_BORDER_STYLES.get(dash, "solid")
 
 
 def _has_arrow(value: str | None) -> bool:
     return bool(value and value.lower() != "none")
 
 
-def _cell_html(value: str) -> str:
-    return html_escape(value or "")
-
-
 def _sheet_padding_px(sheet: SheetDoc) -> tuple[float, float, float, float]:
     margins = sheet.page_margins
     return (
@@ -557,43 +825,26 @@ def _decode_header_footer(raw: str, sheet_name: str) -> dict[str, str]:
 
 
 def _split_hf_sections(raw: str) -> dict[str, str]:
-    sections = {"L": "", "C": "", "R": ""}
-    current = "C"
-    i = 0
-    while i < len(raw):
-        if raw[i] == "&" and i + 1 < len(raw) and raw[i + 1] in {"L", "C", "R"}:
-            current = raw[i + 1]
-            i += 2
-            continue
-        sections[current] += raw[i]
-        i += 1
+    parts = _HF_SECTION_RE.split(raw)
+    sections = {"L": "", "C": parts[0], "R": ""}
+    for i in range(1, len(parts), 2):
+        sections[parts[i]] += parts[i + 1]
     return sections
 
 
 def _clean_hf_text(text: str, sheet_name: str) -> str:
-    cleaned = text.replace("&&", "&")
-    token_map = {
-        "&P": "{page}",
-        "&N": "{pages}",
-        "&D": "{date}",
-        "&T": "{time}",
-        "&A": sheet_name,
-        "&F": "{file}",
-        "&Z": "{path}",
-        "&G": "{image}",
-    }
-    for token, replacement in token_map.items():
-        cleaned = cleaned.replace(token, replacement)
+    def _replace(match: re.Match[str]) -> str:
+        code = match.group()[1]
+        if code == "&":
+            return "&"
+        if code == "A":
+            return sheet_name
+        return _HF_TOKEN_TEXT.get(code, "")
 
-    cleaned = re.sub(r'&"[^"]*"', "", cleaned)
-    cleaned = re.sub(r"&K[0-9A-Fa-f]{6}", "", cleaned)
-    cleaned = re.sub(r"&[0-9]+", "", cleaned)
-    cleaned = re.sub(r"&[BIESUXY]", "", cleaned)
-    cleaned = cleaned.replace("\r", " ").replace("\n", " ")
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    return cleaned
+    return _HF_SPACE_RE.sub(" ", _HF_TOKEN_RE.sub(_replace, text))
 
 
+@lru_cache(maxsize=1024)
 def _col_width_to_px(width: float | None) -> float:
     if width is None:
         return 64.0
@@ -602,28 +853,29 @@ def _col_width_to_px(width: float | None) -> float:
     return max(20.0, float(px))
 
 
+@lru_cache(maxsize=1024)
 def _row_height_to_px(height: float | None) -> float:
     if height is None:
         return 20.0
     return max(12.0, height * (96.0 / 72.0))
 
 
-def _kv_table(payload: dict) -> str:
-    lines: list[str] = []
-    lines.append('<table class="simple">')
-    lines.append("<thead><tr><th>key</th><th>value</th></tr></thead><tbody>")
-    for key, value in payload.items():
-        if isinstance(value, (dict, list, tuple)):
-            value_text = json.dumps(value, ensure_ascii=False)
-        else:
-            value_text = str(value)
-        lines.append(f"<tr><td>{html_escape(str(key))}</td><td>{html_escape(value_text)}</td></tr>")
-    lines.append("</tbody></table>")
-    return "\n".join(lines)
+def _kv_table(w: Callable[[str], object], payload: dict) -> None:
+    escape = html_escape
+    text = kv_value_text
+    w('<table class="simple">\n<thead><tr><th>key</th><th>value</th></tr></thead><tbody>\n')
+    w(
+        "".join(
+            [
+                f"<tr><td>{escape(str(key))}</td><td>{escape(text(value))}</td></tr>\n"
+                for key, value in payload.items()
+            ]
+        )
+    )
+    w("</tbody></table>\n")
 
 
-def _html_css() -> str:
-    return """<style>
+_HTML_CSS = """<style>
 :root {
   --line: #d0d7de;
   --line-head: #bcc6d4;
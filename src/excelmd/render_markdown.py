@@ -2,236 +2,264 @@ from __future__ import annotations
 
 import json
 import re
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from html import escape as html_escape
+from itertools import repeat
 
 from .model import SheetDoc, WorkbookDoc
-from .parser.utils import parse_range_ref, rowcol_to_coord
+from .parser.utils import index_to_col, parse_range_ref
+from .render_common import build_style_attrs, kv_value_text, sheetview_ranges
 
 _NUMBER_RE = re.compile(r"^[+-]?(?:\d+|\d+\.\d+)$")
 _COORD_RE = re.compile(r"^([A-Z]+)(\d+)$")
 
 
-def render_workbook_markdown(workbook: WorkbookDoc) -> str:
+def render_workbook_markdown(
+    workbook: WorkbookDoc,
+    *,
+    compact: bool = False,
+    workers: int | None = None,
+) -> str:
+    return _join_lines(_markdown_lines(workbook, compact, workers))
+
+
+def iter_workbook_markdown(
+    workbook: WorkbookDoc,
+    *,
+    compact: bool = False,
+    workers: int | None = None,
+) -> Iterator[str]:
+    lines = _markdown_lines(workbook, compact, workers)
+    _finish_lines(lines)
+    for line in lines:
+        yield line
+        yield "\n"
+
+
+def _markdown_lines(workbook: WorkbookDoc, compact: bool, workers: int | None) -> list[str]:
     if workbook.options.output_mode == "full":
-        return _render_full_markdown(workbook)
-    if workbook.options.output_mode == "sheetview":
-        return _render_sheetview_markdown(workbook)
-    return _render_work_markdown(workbook)
+        lines = _full_markdown_lines(workbook, workers)
+    elif workbook.options.output_mode == "sheetview":
+        lines = _sheetview_markdown_lines(workbook, workers)
+    else:
+        lines = _work_markdown_lines(workbook, workers)
+    if compact:
+        _drop_empty_sections(lines)
+    return lines
+
 
+def _sheet_blocks(
+    render_sheet: Callable[..., list[str]],
+    sheets: list[SheetDoc],
+    workers: int | None,
+    *args,
+) -> list[list[str]]:
+    if workers is not None and workers > 1 and len(sheets) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sheets))) as pool:
+            return list(pool.map(render_sheet, sheets, *[repeat(arg) for arg in args]))
+    return [render_sheet(sheet, *args) for sheet in sheets]
 
-def _render_work_markdown(workbook: WorkbookDoc) -> str:
+
+_SHEET_INDEX_HEADER = ("| index | sheet | state | inferred_role | print_area |", "|---:|---|---|---|---|")
+_FORMULA_CELLS_HEADER = ("| coord | value | cached_value |", "|---|---|---|")
+_INPUT_RULES_HEADER = ("| sqref | type | formula1 | formula2 |", "|---|---|---|---|")
+_EDGE_EXAMPLES_HEADER = ("| from | to | label | direction |", "|---|---|---|---|")
+_IMAGE_ASSETS_HEADER = ("| object_uid | target | content_type | in_full_mode |", "|---|---|---|---|")
+
+
+def _work_markdown_lines(workbook: WorkbookDoc, workers: int | None) -> list[str]:
     lines: list[str] = []
+    append = lines.append
+    esc = _esc
 
-    lines.append(f"# Workbook: {workbook.source_path.name}")
-    lines.append("")
+    append(f"# Workbook: {workbook.source_path.name}")
+    append("")
 
-    lines.append("## Source Metadata")
-    lines.append("")
+    append("## Source Metadata")
+    append("")
     _append_key_value_table(lines, workbook.source_metadata)
 
-    lines.append("")
-    lines.append("## Workbook Workboard")
-    lines.append("")
-    lines.append(f"- workbook_type: `{_infer_document_type(workbook)}`")
-    lines.append(
+    append("")
+    append("## Workbook Workboard")
+    append("")
+    append(f"- workbook_type: `{_infer_document_type(workbook)}`")
+    append(
         f"- global_metrics: `sheets={workbook.summary.get('sheet_count', 0)}, "
         f"cells={workbook.summary.get('cell_count', 0)}, merges={workbook.summary.get('merge_count', 0)}, "
         f"formulas={workbook.summary.get('formula_count', 0)}, drawings={workbook.summary.get('drawing_object_count', 0)}, "
         f"connectors={workbook.summary.get('connector_count', 0)}, images={workbook.summary.get('embedded_image_count', 0)}`"
     )
 
-    lines.append("")
-    lines.append("| index | sheet | state | inferred_role | print_area |")
-    lines.append("|---:|---|---|---|---|")
-    for sheet in workbook.sheets:
-        lines.append(
-            "| "
-            + " | ".join(
-                [
-                    str(sheet.index),
-                    _esc(sheet.name),
-                    _esc(sheet.state),
-                    _esc(_infer_sheet_role(sheet.name)),
-                    _esc(", ".join(r.ref for r in sheet.print_areas) if sheet.print_areas else "(none)"),
-                ]
-            )
-            + " |"
-        )
+    append("")
+    lines.extend(_SHEET_INDEX_HEADER)
+    lines.extend(
+        [
+            f"| {sheet.index} | {esc(sheet.name)} | {esc(sheet.state)} | "
+            f"{esc(_infer_sheet_role(sheet.name))} | "
+            f"{esc(', '.join(r.ref for r in sheet.print_areas) if sheet.print_areas else '(none)')} |"
+            for sheet in workbook.sheets
+        ]
+    )
 
-    lines.append("")
-    lines.append("## Defined Names")
-    lines.append("")
+    append("")
+    append("## Defined Names")
+    append("")
     if not workbook.defined_names:
-        lines.append("(none)")
+        append("(none)")
     else:
-        lines.append("| name | local_sheet_id | value |")
-        lines.append("|---|---:|---|")
-        for dn in workbook.defined_names:
-            lines.append(
-                "| "
-                + " | ".join(
-                    [
-                        _esc(dn.name),
-                        _esc("" if dn.local_sheet_id is None else str(dn.local_sheet_id)),
-                        _esc(_short(dn.value, 160)),
-                    ]
-                )
-                + " |"
-            )
-
-    for sheet in workbook.sheets:
-        lines.append("")
-        lines.append(f"## Sheet: {sheet.name} [{sheet.state}]")
-        lines.append("")
-
-        formula_count = sum(1 for c in sheet.cells if c.formula)
-        image_count = sum(1 for obj in sheet.drawings if obj.image_target)
-
-        lines.append("### Work Context")
-        lines.append("")
-        lines.append(f"- used_range: `{sheet.dimension_ref}`")
-        lines.append(
-            f"- metrics: `cells={len(sheet.cells)}, merges={len(sheet.merges)}, formulas={formula_count}, "
-            f"regions={len(sheet.regions)}, validations={len(sheet.data_validations)}, drawings={len(sheet.drawings)}, "
-            f"connectors={len(sheet.connectors)}, images={image_count}`"
+        lines.extend(_DEFINED_NAMES_HEADER)
+        lines.extend(
+            [
+                f"| {esc(dn.name)} | {esc('' if dn.local_sheet_id is None else str(dn.local_sheet_id))} | "
+                f"{esc(_short(dn.value, 160))} |"
+                for dn in workbook.defined_names
+            ]
         )
-        lines.append(f"- print_areas: `{', '.join(r.ref for r in sheet.print_areas) if sheet.print_areas else '(none)'}`")
-        lines.append(f"- print_titles: `{', '.join(sheet.print_titles) if sheet.print_titles else '(none)'}`")
-        lines.append(f"- key_texts: `{ ' / '.join(_representative_texts(sheet, 14)) or '(none)' }`")
 
-        lines.append("")
-        lines.append("### Region Workspaces")
-        lines.append("")
-        if not sheet.regions:
-            lines.append("(none)")
-        else:
-            for region in sheet.regions:
-                _append_region_workspace(lines, region.region_id, region.bounds.ref, region.rows)
+    for sheet_lines in _sheet_blocks(_work_sheet_lines, workbook.sheets, workers):
+        lines.extend(sheet_lines)
 
-        lines.append("")
-        lines.append("### Calculated Cells (Displayed Results)")
-        lines.append("")
-        formula_cells = [c for c in sheet.cells if c.formula]
-        if not formula_cells:
-            lines.append("(none)")
-        else:
-            lines.append("| coord | value | cached_value |")
-            lines.append("|---|---|---|")
-            for cell in formula_cells:
-                lines.append(
-                    "| "
-                    + " | ".join(
-                        [
-                            _esc(cell.coord),
-                            _esc(_short(cell.display_value, 60)),
-                            _esc(_short(cell.cached_value or "", 60)),
-                        ]
-                    )
-                    + " |"
-                )
+    append("")
+    append("## Extraction Summary")
+    append("")
+    _append_key_value_table(lines, workbook.summary)
 
-        lines.append("")
-        lines.append("### Input Rules")
-        lines.append("")
-        if not sheet.data_validations:
-            lines.append("(none)")
-        else:
-            lines.append("| sqref | type | formula1 | formula2 |")
-            lines.append("|---|---|---|---|")
-            for dv in sheet.data_validations:
-                lines.append(
-                    "| "
-                    + " | ".join(
-                        [
-                            _esc(dv.sqref),
-                            _esc(dv.type or ""),
-                            _esc(_short(dv.formula1 or "", 80)),
-                            _esc(_short(dv.formula2 or "", 80)),
-                        ]
-                    )
-                    + " |"
-                )
+    append("")
+    append("## Warnings")
+    append("")
+    if not workbook.warnings:
+        append("(none)")
+    else:
+        for warning in workbook.warnings:
+            append(f"- {warning}")
 
-        lines.append("")
-        lines.append("### Diagram Workspace")
-        lines.append("")
-        if not sheet.drawings and not sheet.connectors:
-            lines.append("(none)")
-        else:
-            lines.append(
-                f"- diagram_metrics: `nodes={sum(1 for o in sheet.drawings if o.kind != 'cxnSp')}, "
-                f"raw_connectors={len(sheet.connectors)}, resolved_edges={sum(1 for c in sheet.connectors if c.resolved)}`"
-            )
+    append("")
+    append("## Mode")
+    append("")
+    append("- current_output: `work` (operator-friendly)")
+    append("- switch_to_full_dump: `excel-md INPUT.xlsx -o OUTPUT.md --full`")
 
-            examples = _connector_examples(sheet, 16)
-            if examples:
-                lines.append("")
-                lines.append("| from | to | label | direction |")
-                lines.append("|---|---|---|---|")
-                for src, dst, label, direction in examples:
-                    lines.append("| " + " | ".join([_esc(src), _esc(dst), _esc(label), _esc(direction)]) + " |")
+    return lines
 
-            if sheet.mermaid:
-                lines.append("")
-                lines.append("```mermaid")
-                lines.append(sheet.mermaid)
-                lines.append("```")
 
-        lines.append("")
-        lines.append("### Image Assets")
-        lines.append("")
-        images = [obj for obj in sheet.drawings if obj.image_target]
-        if not images:
-            lines.append("(none)")
-        else:
-            lines.append("| object_uid | target | content_type | in_full_mode |")
-            lines.append("|---|---|---|---|")
-            for obj in images:
-                lines.append(
-                    "| "
-                    + " | ".join(
-                        [
-                            _esc(obj.object_uid),
-                            _esc(obj.image_target or ""),
-                            _esc(obj.image_content_type or ""),
-                            "data_uri",
-                        ]
-                    )
-                    + " |"
-                )
-
-        lines.append("")
-        lines.append("### Unsupported Elements")
-        lines.append("")
-        if not sheet.unsupported:
-            lines.append("(none)")
-        else:
-            lines.append("| scope | location | tag |")
-            lines.append("|---|---|---|")
-            for item in sheet.unsupported:
-                lines.append("| " + " | ".join([_esc(item.scope), _esc(item.location), _esc(item.tag)]) + " |")
+def _work_sheet_lines(sheet: SheetDoc) -> list[str]:
+    lines: list[str] = []
+    append = lines.append
+    esc = _esc
+    append("")
+    append(f"## Sheet: {sheet.name} [{sheet.state}]")
+    append("")
+
+    formula_cells = [c for c in sheet.cells if c.formula]
+    images = [obj for obj in sheet.drawings if obj.image_target]
+
+    append("### Work Context")
+    append("")
+    append(f"- used_range: `{sheet.dimension_ref}`")
+    append(
+        f"- metrics: `cells={len(sheet.cells)}, merges={len(sheet.merges)}, formulas={len(formula_cells)}, "
+        f"regions={len(sheet.regions)}, validations={len(sheet.data_validations)}, drawings={len(sheet.drawings)}, "
+        f"connectors={len(sheet.connectors)}, images={len(images)}`"
+    )
+    append(f"- print_areas: `{', '.join(r.ref for r in sheet.print_areas) if sheet.print_areas else '(none)'}`")
+    append(f"- print_titles: `{', '.join(sheet.print_titles) if sheet.print_titles else '(none)'}`")
+    append(f"- key_texts: `{ ' / '.join(_representative_texts(sheet, 14)) or '(none)' }`")
+
+    append("")
+    append("### Region Workspaces")
+    append("")
+    if not sheet.regions:
+        append("(none)")
+    else:
+        for region in sheet.regions:
+            _append_region_workspace(lines, region.region_id, region.bounds.ref, region.rows)
+
+    append("")
+    append("### Calculated Cells (Displayed Results)")
+    append("")
+    if not formula_cells:
+        append("(none)")
+    else:
+        lines.extend(_FORMULA_CELLS_HEADER)
+        lines.extend(
+            [
+                f"| {esc(cell.coord)} | {esc(_short(cell.display_value, 60))} | "
+                f"{esc(_short(cell.cached_value or '', 60))} |"
+                for cell in formula_cells
+            ]
+        )
 
-    lines.append("")
-    lines.append("## Extraction Summary")
-    lines.append("")
-    _append_key_value_table(lines, workbook.summary)
+    append("")
+    append("### Input Rules")
+    append("")
+    if not sheet.data_validations:
+        append("(none)")
+    else:
+        lines.extend(_INPUT_RULES_HEADER)
+        lines.extend(
+            [
+                f"| {esc(dv.sqref)} | {esc(dv.type or '')} | {esc(_short(dv.formula1 or '', 80))} | "
+                f"{esc(_short(dv.formula2 or '', 80))} |"
+                for dv in sheet.data_validations
+            ]
+        )
 
-    lines.append("")
-    lines.append("## Warnings")
-    lines.append("")
-    if not workbook.warnings:
-        lines.append("(none)")
+    append("")
+    append("### Diagram Workspace")
+    append("")
+    if not sheet.drawings and not sheet.connectors:
+        append("(none)")
     else:
-        for warning in workbook.warnings:
-            lines.append(f"- {warning}")
+        append(
+            f"- diagram_metrics: `nodes={sum(1 for o in sheet.drawings if o.kind != 'cxnSp')}, "
+            f"raw_connectors={len(sheet.connectors)}, resolved_edges={sum(1 for c in sheet.connectors if c.resolved)}`"
+        )
 
-    lines.append("")
-    lines.append("## Mode")
-    lines.append("")
-    lines.append("- current_output: `work` (operator-friendly)")
-    lines.append("- switch_to_full_dump: `excel-md INPUT.xlsx -o OUTPUT.md --full`")
+        examples = _connector_examples(sheet, 16)
+        if examples:
+            append("")
+            lines.extend(_EDGE_EXAMPLES_HEADER)
+            lines.extend(
+                [
+                    f"| {esc(src)} | {esc(dst)} | {esc(label)} | {esc(direction)} |"
+                    for src, dst, label, direction in examples
+                ]
+            )
 
-    return "\n".join(lines).rstrip() + "\n"
+        if sheet.mermaid:
+            append("")
+            append("```mermaid")
+            append(sheet.mermaid)
+            append("```")
+
+    append("")
+    append("### Image Assets")
+    append("")
+    if not images:
+        append("(none)")
+    else:
+        lines.extend(_IMAGE_ASSETS_HEADER)
+        lines.extend(
+            [
+                f"| {esc(obj.object_uid)} | {esc(obj.image_target or '')} | "
+                f"{esc(obj.image_content_type or '')} | data_uri |"
+                for obj in images
+            ]
+        )
+
+    append("")
+    append("### Unsupported Elements")
+    append("")
+    if not sheet.unsupported:
+        append("(none)")
+    else:
+        lines.extend(_UNSUPPORTED_HEADER)
+        lines.extend(
+            [f"| {esc(item.scope)} | {esc(item.location)} | {esc(item.tag)} |" for item in sheet.unsupported]
+        )
+    return lines
 
 
 def _append_region_workspace(lines: list[str], region_id: int, bounds_ref: str, region_rows) -> None:
@@ -254,7 +282,7 @@ def _append_region_workspace(lines: list[str], region_id: int, bounds_ref: str,
     lines.append("```text")
     for row_num in sorted(row_map):
         cells = sorted(row_map[row_num], key=lambda x: _col_index(x[0]))
-        payload = " | ".join(f"{col}={text}" for col, text in cells)
+        payload = " | ".join([f"{col}={text}" for col, text in cells])
         lines.append(f"R{row_num} | {payload}")
     lines.append("```")
     lines.append("")
@@ -374,6 +402,7 @@ def _coord_parts(coord: str) -> tuple[str, int]:
     return match.group(1), int(match.group(2))
 
 
+@lru_cache(maxsize=16384)
 def _col_index(col: str) -> int:
     value = 0
     for ch in col:
@@ -389,7 +418,7 @@ def _short(value: str, limit: int) -> str:
     return value[: limit - 3] + "..."
 
 
-def _render_sheetview_markdown(workbook: WorkbookDoc) -> str:
+def _sheetview_markdown_lines(workbook: WorkbookDoc, workers: int | None) -> list[str]:
     lines: list[str] = []
     lines.append(f"# Workbook: {workbook.source_path.name}")
     lines.append("")
@@ -397,33 +426,11 @@ def _render_sheetview_markdown(workbook: WorkbookDoc) -> str:
     lines.append("")
     _append_key_value_table(lines, workbook.source_metadata)
     lines.append("")
-    lines.append("## SheetView (Markdown + HTML)")
-    lines.append("")
-    lines.append(
-        "- note: this mode tries to reproduce Excel sheet-view layout with merged cells, "
-        "row/column geometry, cell styles, and drawing overlays."
-    )
-    lines.append("")
-    lines.append(_sheetview_css_block())
+    lines.append(_SHEETVIEW_INTRO)
 
-    for sheet in workbook.sheets:
-        lines.append("")
-        lines.append(f"## Sheet: {sheet.name} [{sheet.state}]")
-        lines.append("")
-        lines.append(
-            f"- used_range: `{sheet.dimension_ref}` / print_areas: "
-            f"`{', '.join(r.ref for r in sheet.print_areas) if sheet.print_areas else '(none)'}`"
-        )
-        ranges = _sheetview_ranges(sheet)
-        for idx, rng in enumerate(ranges, start=1):
-            lines.extend(
-                _render_sheetview_range(
-                    sheet=sheet,
-                    range_ref=rng.ref,
-                    index=idx,
-                    style_css_map=workbook.style_css_map,
-                )
-            )
+    style_attrs = build_style_attrs(workbook.style_css_map)
+    for sheet_lines in _sheet_blocks(_sheetview_sheet_lines, workbook.sheets, workers, style_attrs):
+        lines.extend(sheet_lines)
 
     lines.append("")
     lines.append("## Extraction Summary")
@@ -439,11 +446,10 @@ def _render_sheetview_markdown(workbook: WorkbookDoc) -> str:
         for warning in workbook.warnings:
             lines.append(f"- {warning}")
 
-    return "\n".join(lines).rstrip() + "\n"
+    return lines
 
 
-def _sheetview_css_block() -> str:
-    return """<style>
+_SHEETVIEW_CSS = """<style>
 .sv-wrap { margin: 12px 0 28px; border: 1px solid #d0d7de; border-radius: 8px; overflow: auto; background: #fff; }
 .sv-title { font: 600 13px/1.4 'SF Mono', Menlo, Consolas, monospace; padding: 8px 10px; border-bottom: 1px solid #d0d7de; background: #f6f8fa; }
 .sv-canvas { position: relative; display: inline-block; }
@@ -455,42 +461,64 @@ def _sheetview_css_block() -> str:
 .sv-shape.pic { border: none; background: transparent; }
 .sv-lines { position: absolute; inset: 0; overflow: visible; }
 </style>"""
+_SHEETVIEW_INTRO = (
+    "## SheetView (Markdown + HTML)\n"
+    "\n"
+    "- note: this mode tries to reproduce Excel sheet-view layout with merged cells, "
+    "row/column geometry, cell styles, and drawing overlays.\n"
+    "\n" + _SHEETVIEW_CSS
+)
 
 
-def _sheetview_ranges(sheet: SheetDoc):
-    if sheet.print_areas:
-        return sheet.print_areas
-    try:
-        return [parse_range_ref(sheet.dimension_ref)]
-    except ValueError:
-        return []
+def _sheetview_sheet_lines(sheet: SheetDoc, style_attrs: dict[str, str]) -> list[str]:
+    lines: list[str] = []
+    lines.append("")
+    lines.append(f"## Sheet: {sheet.name} [{sheet.state}]")
+    lines.append("")
+    lines.append(
+        f"- used_range: `{sheet.dimension_ref}` / print_areas: "
+        f"`{', '.join(r.ref for r in sheet.print_areas) if sheet.print_areas else '(none)'}`"
+    )
+    ranges = sheetview_ranges(sheet)
+    for idx, rng in enumerate(ranges, start=1):
+        _append_sheetview_range(
+            lines,
+            sheet=sheet,
+            range_ref=rng.ref,
+            index=idx,
+            style_attrs=style_attrs,
+        )
+    return lines
 
 
-def _render_sheetview_range(
+def _append_sheetview_range(
+    lines: list[str],
     sheet: SheetDoc,
     range_ref: str,
     index: int,
-    style_css_map: dict[str, str],
-) -> list[str]:
-    lines: list[str] = []
+    style_attrs: dict[str, str],
+) -> None:
     rng = parse_range_ref(range_ref)
     lines.append(f"### SheetView Range {index}: {range_ref}")
     lines.append("")
 
-    merge_anchor: dict[str, tuple[int, int, str]] = {}
-    merge_covered: set[str] = set()
+    merge_anchor: dict[tuple[int, int], tuple[int, int, str]] = {}
+    merge_covered: set[tuple[int, int]] = set()
     for m in sheet.merges:
         if m.end_row < rng.start_row or m.start_row > rng.end_row:
             continue
         if m.end_col < rng.start_col or m.start_col > rng.end_col:
             continue
-        tl = rowcol_to_coord(m.start_row, m.start_col)
-        merge_anchor[tl] = (m.end_row - m.start_row + 1, m.end_col - m.start_col + 1, m.ref)
-        for rr in range(m.start_row, m.end_row + 1):
-            for cc in range(m.start_col, m.end_col + 1):
-                if rr == m.start_row and cc == m.start_col:
-                    continue
-                merge_covered.add(rowcol_to_coord(rr, cc))
+        anchor = (m.start_row, m.start_col)
+        merge_anchor[anchor] = (m.end_row - m.start_row + 1, m.end_col - m.start_col + 1, m.ref)
+        m_cols = range(max(m.start_col, rng.start_col), min(m.end_col, rng.end_col) + 1)
+        cells = {
+            (rr, cc)
+            for rr in range(max(m.start_row, rng.start_row), min(m.end_row, rng.end_row) + 1)
+            for cc in m_cols
+        }
+        cells.discard(anchor)
+        merge_covered |= cells
 
     col_px: dict[int, float] = {}
     row_px: dict[int, float] = {}
@@ -507,69 +535,79 @@ def _render_sheetview_range(
     lines.append('<div class="sv-canvas">')
     lines.append('<table class="sv-grid">')
     lines.append("<colgroup>")
+    col_tags: dict[float, str] = {}
     for col in range(rng.start_col, rng.end_col + 1):
-        lines.append(f'<col style="width:{col_px[col]:.1f}px">')
+        width = col_px[col]
+        tag = col_tags.get(width)
+        if tag is None:
+            tag = col_tags[width] = f'<col style="width:{width:.1f}px">'
+        lines.append(tag)
     lines.append("</colgroup>")
     lines.append("<tbody>")
 
+    col_labels = [(col, index_to_col(col)) for col in range(rng.start_col, rng.end_col + 1)]
+    cell_rc_map = sheet.cell_rc_map
+    text_cache: dict[str, tuple[str, str]] = {}
+    tr_tags: dict[float, str] = {}
     for row in range(rng.start_row, rng.end_row + 1):
-        lines.append(f'<tr style="height:{row_px[row]:.1f}px">')
-        for col in range(rng.start_col, rng.end_col + 1):
-            coord = rowcol_to_coord(row, col)
-            if coord in merge_covered:
+        height = row_px[row]
+        tag = tr_tags.get(height)
+        if tag is None:
+            tag = tr_tags[height] = f'<tr style="height:{height:.1f}px">'
+        row_parts = [tag]
+        append = row_parts.append
+        for col, label in col_labels:
+            if (row, col) in merge_covered:
                 continue
-
-            cell = sheet.cell_map.get(coord)
+            cell = cell_rc_map.get((row, col))
             style_id = cell.style_id if cell and cell.style_id is not None else "0"
-            style_css = style_css_map.get(style_id, "")
-            if style_css and not style_css.strip().endswith(";"):
-                style_css += ";"
-
-            attrs: list[str] = []
-            if coord in merge_anchor:
-                rowspan, colspan, merge_ref = merge_anchor[coord]
-                attrs.append(f'rowspan="{rowspan}"')
-                attrs.append(f'colspan="{colspan}"')
-                attrs.append(f'data-merge="{html_escape(merge_ref)}"')
-
-            text_html = _sheetview_cell_html(cell.display_value if cell else "")
-            classes = ["sv-cell"]
-            if not text_html.strip():
-                classes.append("sv-empty")
-            attrs.append(f'class="{" ".join(classes)}"')
-            attrs.append(f'data-coord="{coord}"')
-            if style_css:
-                attrs.append(f'style="{html_escape(style_css)}"')
-
-            lines.append(f"<td {' '.join(attrs)}>{text_html}</td>")
-        lines.append("</tr>")
+            style_attr = style_attrs.get(style_id, "")
+
+            merge = merge_anchor.get((row, col))
+            if merge is not None:
+                rowspan, colspan, merge_ref = merge
+                merge_attrs = f'rowspan="{rowspan}" colspan="{colspan}" data-merge="{html_escape(merge_ref)}" '
+            else:
+                merge_attrs = ""
+
+            value = cell.display_value if cell else ""
+            escaped = text_cache.get(value)
+            if escaped is None:
+                if value and not value.isspace():
+                    escaped = text_cache[value] = ('class="sv-cell"', _sheetview_cell_html(value))
+                else:
+                    escaped = text_cache[value] = ('class="sv-cell sv-empty"', value)
+            class_attr, text_html = escaped
+            append(f'<td {merge_attrs}{class_attr} data-coord="{label}{row}"{style_attr}>{text_html}</td>')
+        append("</tr>")
+        lines.append("\n".join(row_parts))
     lines.append("</tbody>")
     lines.append("</table>")
-    lines.extend(_sheetview_overlay_html(sheet, rng, total_w, total_h))
+    _append_sheetview_overlay(lines, sheet, rng, total_w, total_h)
     lines.append("</div>")
     lines.append("</div>")
     lines.append("")
-    return lines
 
 
-def _sheetview_overlay_html(sheet: SheetDoc, rng, total_w: int, total_h: int) -> list[str]:
-    lines: list[str] = []
+def _append_sheetview_overlay(lines: list[str], sheet: SheetDoc, rng, total_w: int, total_h: int) -> None:
+    if not sheet.drawings and not sheet.connectors:
+        lines.append('<div class="sv-overlay"></div>')
+        return
+
     origin_x = (rng.start_col - 1) * 64.0
     origin_y = (rng.start_row - 1) * 20.0
 
-    def bbox_intersects(obj_bbox: tuple[float, float, float, float]) -> bool:
-        x1, y1, x2, y2 = obj_bbox
-        rx1, ry1, rx2, ry2 = origin_x, origin_y, origin_x + total_w, origin_y + total_h
-        return not (x2 < rx1 or x1 > rx2 or y2 < ry1 or y1 > ry2)
+    rx2 = origin_x + total_w
+    ry2 = origin_y + total_h
+    shapes = [
+        (obj, obj.bbox)
+        for obj in sheet.drawings
+        if obj.kind != "cxnSp"
+        and not (obj.bbox[2] < origin_x or obj.bbox[0] > rx2 or obj.bbox[3] < origin_y or obj.bbox[1] > ry2)
+    ]
 
     lines.append('<div class="sv-overlay">')
-    for obj in sheet.drawings:
-        if obj.kind == "cxnSp":
-            continue
-        if not bbox_intersects(obj.bbox):
-            continue
-
-        x1, y1, x2, y2 = obj.bbox
+    for obj, (x1, y1, x2, y2) in shapes:
         left = max(0.0, x1 - origin_x)
         top = max(0.0, y1 - origin_y)
         width = max(8.0, x2 - x1)
@@ -589,14 +627,25 @@ def _sheetview_overlay_html(sheet: SheetDoc, rng, total_w: int, total_h: int) ->
             f'<div class="{classes}" style="left:{left:.1f}px;top:{top:.1f}px;width:{width:.1f}px;height:{height:.1f}px;">{body}</div>'
         )
 
+    if not sheet.connectors:
+        lines.append("</div>")
+        return
+
     lines.append(f'<svg class="sv-lines" width="{total_w}" height="{total_h}" viewBox="0 0 {total_w} {total_h}">')
     for conn in sheet.connectors:
-        x1, y1 = _connector_point_xy(conn.anchor_from, conn.bbox, True)
-        x2, y2 = _connector_point_xy(conn.anchor_to, conn.bbox, False)
-        x1 -= origin_x
-        x2 -= origin_x
-        y1 -= origin_y
-        y2 -= origin_y
+        start, end, bbox = conn.anchor_from, conn.anchor_to, conn.bbox
+        if start is not None:
+            x1 = start.col * 64.0 + start.col_off / 9525.0 - origin_x
+            y1 = start.row * 20.0 + start.row_off / 9525.0 - origin_y
+        else:
+            x1 = bbox[0] - origin_x
+            y1 = bbox[1] - origin_y
+        if end is not None:
+            x2 = end.col * 64.0 + end.col_off / 9525.0 - origin_x
+            y2 = end.row * 20.0 + end.row_off / 9525.0 - origin_y
+        else:
+            x2 = bbox[2] - origin_x
+            y2 = bbox[3] - origin_y
         if max(x1, x2) < 0 or max(y1, y2) < 0 or min(x1, x2) > total_w or min(y1, y2) > total_h:
             continue
         lines.append(
@@ -605,299 +654,313 @@ def _sheetview_overlay_html(sheet: SheetDoc, rng, total_w: int, total_h: int) ->
         )
     lines.append("</svg>")
     lines.append("</div>")
-    return lines
 
 
 def _sheetview_cell_html(value: str) -> str:
-    return html_escape(value or "")
+    return html_escape(value) if value else ""
 
 
+@lru_cache(maxsize=1024)
 def _col_width_to_px(width: float | None) -> float:
     if width is None:
         return 64.0
     return max(20.0, width * 7.0 + 5.0)
 
 
+@lru_cache(maxsize=1024)
 def _row_height_to_px(height: float | None) -> float:
     if height is None:
         return 20.0
     return max(12.0, height * (96.0 / 72.0))
 
 
-def _connector_point_xy(anchor, bbox: tuple[float, float, float, float], is_start: bool) -> tuple[float, float]:
-    if anchor is not None:
-        x = anchor.col * 64.0 + anchor.col_off / 9525.0
-        y = anchor.row * 20.0 + anchor.row_off / 9525.0
-        return x, y
-    if is_start:
-        return bbox[0], bbox[1]
-    return bbox[2], bbox[3]
-
-
-def _render_full_markdown(workbook: WorkbookDoc) -> str:
+_DEFINED_NAMES_HEADER = ("| name | local_sheet_id | value |", "|---|---:|---|")
+_VALIDATIONS_HEADER = (
+    "| type | sqref | formula1 | formula2 | allow_blank | show_error_message | operator |",
+    "|---|---|---|---|---|---|---|",
+)
+_REGION_HEADER = (
+    "| coord | value | formula | cached_value | type | style_id | merge_ref | flags |",
+    "|---|---|---|---|---|---|---|---|",
+)
+_DRAWINGS_HEADER = (
+    "| object_uid | kind | name | text | anchor_from | anchor_to | bbox | parent_uid | image_target |",
+    "|---|---|---|---|---|---|---|---|---|",
+)
+_CONNECTORS_HEADER = (
+    "| object_uid | name | direction | source_uid | target_uid | resolved | "
+    "distance_source | distance_target | arrow_head | arrow_tail | text |",
+    "|---|---|---|---|---|---|---:|---:|---|---|---|",
+)
+_UNSUPPORTED_HEADER = ("| scope | location | tag |", "|---|---|---|")
+
+
+def _full_markdown_lines(workbook: WorkbookDoc, workers: int | None) -> list[str]:
     lines: list[str] = []
+    append = lines.append
+    esc = _esc
 
-    lines.append(f"# Workbook: {workbook.source_path.name}")
-    lines.append("")
+    append(f"# Workbook: {workbook.source_path.name}")
+    append("")
 
-    lines.append("## Source Metadata")
-    lines.append("")
+    append("## Source Metadata")
+    append("")
     _append_key_value_table(lines, workbook.source_metadata)
 
-    lines.append("")
-    lines.append("## Styles (XML-equivalent)")
-    lines.append("")
-    lines.append("```json")
-    lines.append(json.dumps(workbook.styles_xml_equivalent, ensure_ascii=False, indent=2))
-    lines.append("```")
+    append("")
+    append("## Styles (XML-equivalent)")
+    append("")
+    append("```json")
+    append(json.dumps(workbook.styles_xml_equivalent, ensure_ascii=False, indent=2))
+    append("```")
 
-    lines.append("")
-    lines.append("## Defined Names")
-    lines.append("")
+    append("")
+    append("## Defined Names")
+    append("")
     if not workbook.defined_names:
-        lines.append("(none)")
+        append("(none)")
     else:
-        lines.append("| name | local_sheet_id | value |")
-        lines.append("|---|---:|---|")
-        for dn in workbook.defined_names:
-            lines.append(
-                "| "
-                + " | ".join(
-                    [
-                        _esc(dn.name),
-                        _esc("" if dn.local_sheet_id is None else str(dn.local_sheet_id)),
-                        _esc(dn.value),
-                    ]
-                )
-                + " |"
-            )
+        lines.extend(_DEFINED_NAMES_HEADER)
+        lines.extend(
+            [
+                f"| {esc(dn.name)} | {esc('' if dn.local_sheet_id is None else str(dn.local_sheet_id))} | "
+                f"{esc(dn.value)} |"
+                for dn in workbook.defined_names
+            ]
+        )
 
-    for sheet in workbook.sheets:
-        lines.append("")
-        lines.append(f"## Sheet: {sheet.name} [{sheet.state}]")
-        lines.append("")
+    for sheet_lines in _sheet_blocks(_full_sheet_lines, workbook.sheets, workers):
+        lines.extend(sheet_lines)
 
-        lines.append("### Sheet Metadata")
-        lines.append("")
-        _append_key_value_table(
-            lines,
-            {
-                "sheet_index": sheet.index,
-                "path": sheet.path,
-                "dimension_ref": sheet.dimension_ref,
-                "cell_count": len(sheet.cells),
-                "merge_count": len(sheet.merges),
-                "data_validation_count": len(sheet.data_validations),
-                "drawing_object_count": len(sheet.drawings),
-                "connector_count": len(sheet.connectors),
-                "region_count": len(sheet.regions),
-                "unsupported_count": len(sheet.unsupported),
-            },
-        )
+    append("## Extraction Summary")
+    append("")
+    _append_key_value_table(lines, workbook.summary)
 
-        lines.append("")
-        lines.append("### Print Metadata")
-        lines.append("")
-        lines.append(f"- print_areas: {', '.join(r.ref for r in sheet.print_areas) if sheet.print_areas else '(none)'}")
-        lines.append(f"- print_titles: {', '.join(sheet.print_titles) if sheet.print_titles else '(none)'}")
-        lines.append(f"- page_setup: `{json.dumps(sheet.page_setup, ensure_ascii=False)}`")
-        lines.append(f"- page_margins: `{json.dumps(sheet.page_margins, ensure_ascii=False)}`")
-        lines.append(f"- print_options: `{json.dumps(sheet.print_options, ensure_ascii=False)}`")
-        lines.append(f"- header_footer: `{json.dumps(sheet.header_footer, ensure_ascii=False)}`")
-        lines.append(f"- page_breaks: `{json.dumps(sheet.page_breaks, ensure_ascii=False)}`")
+    append("")
+    append("## Warnings")
+    append("")
+    if not workbook.warnings:
+        append("(none)")
+    else:
+        for warning in workbook.warnings:
+            append(f"- {warning}")
 
-        lines.append("")
-        lines.append("### Data Validations")
-        lines.append("")
-        if not sheet.data_validations:
-            lines.append("(none)")
-        else:
-            lines.append("| type | sqref | formula1 | formula2 | allow_blank | show_error_message | operator |")
-            lines.append("|---|---|---|---|---|---|---|")
-            for dv in sheet.data_validations:
-                lines.append(
-                    "| "
-                    + " | ".join(
-                        [
-                            _esc(dv.type or ""),
-                            _esc(dv.sqref),
-                            _esc(dv.formula1 or ""),
-                            _esc(dv.formula2 or ""),
-                            _esc("" if dv.allow_blank is None else str(dv.allow_blank)),
-                            _esc("" if dv.show_error_message is None else str(dv.show_error_message)),
-                            _esc(dv.operator or ""),
-                        ]
-                    )
-                    + " |"
-                )
+    return lines
 
-        lines.append("")
-        lines.append("### Cell Regions")
-        lines.append("")
-        if not sheet.regions:
-            lines.append("(none)")
-        else:
-            for region in sheet.regions:
-                lines.append(f"#### Region {region.region_id}: {region.bounds.ref}")
-                lines.append("")
-                lines.append("| coord | value | formula | cached_value | type | style_id | merge_ref | flags |")
-                lines.append("|---|---|---|---|---|---|---|---|")
-                for row in region.rows:
-                    lines.append(
-                        "| "
-                        + " | ".join(
-                            [
-                                _esc(row.coord),
-                                _esc(row.value),
-                                _esc(row.formula or ""),
-                                _esc(row.cached_value or ""),
-                                _esc(row.cell_type),
-                                _esc(row.style_id or ""),
-                                _esc(row.merge_ref or ""),
-                                _esc(",".join(row.flags)),
-                            ]
-                        )
-                        + " |"
-                    )
-                lines.append("")
-
-        lines.append("### Drawings Raw Objects")
-        lines.append("")
-        if not sheet.drawings:
-            lines.append("(none)")
-        else:
-            lines.append("| object_uid | kind | name | text | anchor_from | anchor_to | bbox | parent_uid | image_target |")
-            lines.append("|---|---|---|---|---|---|---|---|---|")
-            for obj in sheet.drawings:
-                from_repr = _anchor_repr(obj.anchor_from)
-                to_repr = _anchor_repr(obj.anchor_to)
-                bbox_repr = f"{obj.bbox[0]:.2f},{obj.bbox[1]:.2f},{obj.bbox[2]:.2f},{obj.bbox[3]:.2f}"
-                lines.append(
-                    "| "
-                    + " | ".join(
-                        [
-                            _esc(obj.object_uid),
-                            _esc(obj.kind),
-                            _esc(obj.name),
-                            _esc(obj.text),
-                            _esc(from_repr),
-                            _esc(to_repr),
-                            _esc(bbox_repr),
-                            _esc(obj.parent_uid or ""),
-                            _esc(obj.image_target or ""),
-                        ]
-                    )
-                    + " |"
-                )
 
-        lines.append("")
-        lines.append("### Connectors (Raw + Inferred)")
-        lines.append("")
-        if not sheet.connectors:
-            lines.append("(none)")
-        else:
-            lines.append(
-                "| object_uid | name | direction | source_uid | target_uid | resolved | "
-                "distance_source | distance_target | arrow_head | arrow_tail | text |"
+def _full_sheet_lines(sheet: SheetDoc) -> list[str]:
+    lines: list[str] = []
+    append = lines.append
+    esc = _esc
+    append("")
+    append(f"## Sheet: {sheet.name} [{sheet.state}]")
+    append("")
+
+    append("### Sheet Metadata")
+    append("")
+    _append_key_value_table(
+        lines,
+        {
+            "sheet_index": sheet.index,
+            "path": sheet.path,
+            "dimension_ref": sheet.dimension_ref,
+            "cell_count": len(sheet.cells),
+            "merge_count": len(sheet.merges),
+            "data_validation_count": len(sheet.data_validations),
+            "drawing_object_count": len(sheet.drawings),
+            "connector_count": len(sheet.connectors),
+            "region_count": len(sheet.regions),
+            "unsupported_count": len(sheet.unsupported),
+        },
+    )
+
+    append("")
+    append("### Print Metadata")
+    append("")
+    append(f"- print_areas: {', '.join(r.ref for r in sheet.print_areas) if sheet.print_areas else '(none)'}")
+    append(f"- print_titles: {', '.join(sheet.print_titles) if sheet.print_titles else '(none)'}")
+    append(f"- page_setup: `{_dumps_items(tuple(sheet.page_setup.items()))}`")
+    append(f"- page_margins: `{_dumps_items(tuple(sheet.page_margins.items()))}`")
+    append(f"- print_options: `{_dumps_items(tuple(sheet.print_options.items()))}`")
+    append(f"- header_footer: `{_dumps_items(tuple(sheet.header_footer.items()))}`")
+    page_breaks = json.dumps(sheet.page_breaks, ensure_ascii=False) if sheet.page_breaks else "{}"
+    append(f"- page_breaks: `{page_breaks}`")
+
+    append("")
+    append("### Data Validations")
+    append("")
+    if not sheet.data_validations:
+        append("(none)")
+    else:
+        lines.extend(_VALIDATIONS_HEADER)
+        lines.extend(
+            [
+                f"| {esc(dv.type or '')} | {esc(dv.sqref)} | {esc(dv.formula1 or '')} | "
+                f"{esc(dv.formula2 or '')} | {esc('' if dv.allow_blank is None else str(dv.allow_blank))} | "
+                f"{esc('' if dv.show_error_message is None else str(dv.show_error_message))} | "
+                f"{esc(dv.operator or '')} |"
+                for dv in sheet.data_validations
+            ]
+        )
+
+    append("")
+    append("### Cell Regions")
+    append("")
+    if not sheet.regions:
+        append("(none)")
+    else:
+        for region in sheet.regions:
+            append(f"#### Region {region.region_id}: {region.bounds.ref}")
+            append("")
+            lines.extend(_REGION_HEADER)
+            lines.extend(
+                [
+                    f"| {esc(row.coord)} | {esc(row.value)} | {esc(row.formula or '')} | "
+                    f"{esc(row.cached_value or '')} | {esc(row.cell_type)} | {esc(row.style_id or '')} | "
+                    f"{esc(row.merge_ref or '')} | {esc(','.join(row.flags))} |"
+                    for row in region.rows
+                ]
             )
-            lines.append("|---|---|---|---|---|---|---:|---:|---|---|---|")
-            for conn in sheet.connectors:
-                lines.append(
-                    "| "
-                    + " | ".join(
-                        [
-                            _esc(conn.object_uid),
-                            _esc(conn.name),
-                            _esc(conn.direction),
-                            _esc(conn.source_uid or ""),
-                            _esc(conn.target_uid or ""),
-                            _esc(str(conn.resolved)),
-                            _esc("" if conn.distance_source is None else f"{conn.distance_source:.2f}"),
-                            _esc("" if conn.distance_target is None else f"{conn.distance_target:.2f}"),
-                            _esc(conn.arrow_head or ""),
-                            _esc(conn.arrow_tail or ""),
-                            _esc(conn.text),
-                        ]
-                    )
-                    + " |"
-                )
+            append("")
 
-        lines.append("")
-        lines.append("### Mermaid")
-        lines.append("")
-        if sheet.mermaid:
-            lines.append("```mermaid")
-            lines.append(sheet.mermaid)
-            lines.append("```")
-        else:
-            lines.append("(no resolved edges)")
+    append("### Drawings Raw Objects")
+    append("")
+    if not sheet.drawings:
+        append("(none)")
+    else:
+        lines.extend(_DRAWINGS_HEADER)
+        lines.extend(
+            [
+                f"| {esc(obj.object_uid)} | {esc(obj.kind)} | {esc(obj.name)} | {esc(obj.text)} | "
+                f"{esc(_anchor_repr(obj.anchor_from))} | {esc(_anchor_repr(obj.anchor_to))} | "
+                f"{esc(_bbox_repr(obj.bbox))} | {esc(obj.parent_uid or '')} | {esc(obj.image_target or '')} |"
+                for obj in sheet.drawings
+            ]
+        )
 
-        lines.append("")
-        lines.append("### Embedded Images")
-        lines.append("")
-        images = [obj for obj in sheet.drawings if obj.image_data_uri]
-        if not images:
-            lines.append("(none)")
-        else:
-            for idx, img_obj in enumerate(images, start=1):
-                lines.append(f"#### Image {idx}: {img_obj.object_uid}")
-                lines.append("")
-                lines.append(f"- target: `{img_obj.image_target}`")
-                lines.append(f"- content_type: `{img_obj.image_content_type}`")
-                lines.append(f"![{_esc(img_obj.name or img_obj.object_uid)}]({img_obj.image_data_uri})")
-                lines.append("")
-
-        lines.append("### Unsupported Elements")
-        lines.append("")
-        if not sheet.unsupported:
-            lines.append("(none)")
-        else:
-            lines.append("| scope | location | tag |")
-            lines.append("|---|---|---|")
-            for item in sheet.unsupported:
-                lines.append("| " + " | ".join([_esc(item.scope), _esc(item.location), _esc(item.tag)]) + " |")
-            lines.append("")
-            for idx, item in enumerate(sheet.unsupported, start=1):
-                lines.append(f"#### Unsupported {idx}: {item.tag}")
-                lines.append("")
-                lines.append(f"- scope: `{item.scope}`")
-                lines.append(f"- location: `{item.location}`")
-                lines.append("```xml")
-                lines.append(item.raw_xml)
-                lines.append("```")
-                lines.append("")
+    append("")
+    append("### Connectors (Raw + Inferred)")
+    append("")
+    if not sheet.connectors:
+        append("(none)")
+    else:
+        lines.extend(_CONNECTORS_HEADER)
+        lines.extend(
+            [
+                f"| {esc(conn.object_uid)} | {esc(conn.name)} | {esc(conn.direction)} | "
+                f"{esc(conn.source_uid or '')} | {esc(conn.target_uid or '')} | {esc(str(conn.resolved))} | "
+                f"{esc(_distance_repr(conn.distance_source))} | {esc(_distance_repr(conn.distance_target))} | "
+                f"{esc(conn.arrow_head or '')} | {esc(conn.arrow_tail or '')} | {esc(conn.text)} |"
+                for conn in sheet.connectors
+            ]
+        )
 
-    lines.append("## Extraction Summary")
-    lines.append("")
-    _append_key_value_table(lines, workbook.summary)
+    append("")
+    append("### Mermaid")
+    append("")
+    if sheet.mermaid:
+        append("```mermaid")
+        append(sheet.mermaid)
+        append("```")
+    else:
+        append("(no resolved edges)")
+
+    append("")
+    append("### Embedded Images")
+    append("")
+    images = [obj for obj in sheet.drawings if obj.image_data_uri]
+    if not images:
+        append("(none)")
+    else:
+        for idx, img_obj in enumerate(images, start=1):
+            append(f"#### Image {idx}: {img_obj.object_uid}")
+            append("")
+            append(f"- target: `{img_obj.image_target}`")
+            append(f"- content_type: `{img_obj.image_content_type}`")
+            append(f"![{esc(img_obj.name or img_obj.object_uid)}]({img_obj.image_data_uri})")
+            append("")
+
+    append("### Unsupported Elements")
+    append("")
+    if not sheet.unsupported:
+        append("(none)")
+    else:
+        lines.extend(_UNSUPPORTED_HEADER)
+        lines.extend(
+            [f"| {esc(item.scope)} | {esc(item.location)} | {esc(item.tag)} |" for item in sheet.unsupported]
+        )
+        append("")
+        for idx, item in enumerate(sheet.unsupported, start=1):
+            append(f"#### Unsupported {idx}: {item.tag}")
+            append("")
+            append(f"- scope: `{item.scope}`")
+            append(f"- location: `{item.location}`")
+            append("```xml")
+            append(item.raw_xml)
+            append("```")
+            append("")
+    return lines
 
-    lines.append("")
-    lines.append("## Warnings")
-    lines.append("")
-    if not workbook.warnings:
-        lines.append("(none)")
+
+def _drop_empty_sections(lines: list[str]) -> None:
+    kept: list[str] = []
+    idx = 0
+    end = len(lines)
+    while idx < end:
+        line = lines[idx]
+        if line.startswith("#") and idx + 2 < end and not lines[idx + 1] and lines[idx + 2] == "(none)":
+            idx += 3
+            if idx < end and not lines[idx]:
+                idx += 1
+            continue
+        kept.append(line)
+        idx += 1
+    lines[:] = kept
+
+
+def _finish_lines(lines: list[str]) -> None:
+    # Trims the tail like "\n".join(lines).rstrip() would, without copying the whole document.
+    while lines and not lines[-1].strip():
+        lines.pop()
+    if lines:
+        lines[-1] = lines[-1].rstrip()
     else:
-        for warning in workbook.warnings:
-            lines.append(f"- {warning}")
+        lines.append("")
 
-    return "\n".join(lines).rstrip() + "\n"
+
+def _join_lines(lines: list[str]) -> str:
+    _finish_lines(lines)
+    lines.append("")
+    return "\n".join(lines)
 
 
 def _append_key_value_table(lines: list[str], payload: dict) -> None:
     lines.append("| key | value |")
     lines.append("|---|---|")
-    for key, value in payload.items():
-        lines.append(f"| {_esc(str(key))} | {_esc(_compact(value))} |")
+    esc = _esc
+    compact = kv_value_text
+    lines.extend([f"| {esc(str(key))} | {esc(compact(value))} |" for key, value in payload.items()])
 
 
-def _compact(value) -> str:
-    if isinstance(value, (dict, list, tuple)):
-        return json.dumps(value, ensure_ascii=False)
-    return str(value)
+@lru_cache(maxsize=256)
+def _dumps_items(items: tuple[tuple[str, str], ...]) -> str:
+    if not items:
+        return "{}"
+    return json.dumps(dict(items), ensure_ascii=False)
 
 
 def _esc(value: str) -> str:
-    return value.replace("|", "\\|").replace("\n", "<br>")
+    if "|" in value or "\n" in value:
+        return value.replace("|", "\\|").replace("\n", "<br>")
+    return value
+
+
+def _bbox_repr(bbox) -> str:
+    return "%.2f,%.2f,%.2f,%.2f" % bbox[:4]
+
+
+def _distance_repr(distance: float | None) -> str:
+    return "" if distance is None else f"{distance:.2f}"
 
 
 def _anchor_repr(anchor) -> str:
@@ -7,6 +7,53 @@ from zipfile import ZipFile
 SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
 PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
 SHEET_DRAWING_NS = "http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing"
+DOC_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+
+def write_minimal_xlsx(path, sheets: dict[str, str], drawings: dict[str, str] | None = None) -> None:
+    """Write a bare-bones workbook; ``sheets`` maps sheet name to worksheet body XML."""
+    drawings = drawings or {}
+    sheet_tags = []
+    sheet_rels = []
+    with ZipFile(path, "w") as zf:
+        for idx, (name, body) in enumerate(sheets.items(), start=1):
+            sheet_tags.append(f'<sheet name="{name}" sheetId="{idx}" r:id="rId{idx}"/>')
+            sheet_rels.append(
+                f'<Relationship Id="rId{idx}" Type="{DOC_REL_NS}/worksheet" Target="worksheets/sheet{idx}.xml"/>'
+            )
+            drawing_tag = ""
+            if name in drawings:
+                drawing_tag = '<drawing r:id="rId1"/>'
+                zf.writestr(
+                    f"xl/worksheets/_rels/sheet{idx}.xml.rels",
+                    f'<Relationships xmlns="{PACKAGE_REL_NS}">'
+                    f'<Relationship Id="rId1" Type="{DOC_REL_NS}/drawing" Target="../drawings/drawing{idx}.xml"/>'
+                    "</Relationships>",
+                )
+                zf.writestr(
+                    f"xl/drawings/drawing{idx}.xml",
+                    f'<xdr:wsDr xmlns:xdr="{SHEET_DRAWING_NS}" '
+                    f'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">{drawings[name]}</xdr:wsDr>',
+                )
+            zf.writestr(
+                f"xl/worksheets/sheet{idx}.xml",
+                f'<worksheet xmlns="{SPREADSHEET_NS}" xmlns:r="{DOC_REL_NS}">{body}{drawing_tag}</worksheet>',
+            )
+        zf.writestr(
+            "xl/workbook.xml",
+            f'<workbook xmlns="{SPREADSHEET_NS}" xmlns:r="{DOC_REL_NS}"><sheets>{"".join(sheet_tags)}</sheets></workbook>',
+        )
+        zf.writestr(
+            "xl/_rels/workbook.xml.rels",
+            f'<Relationships xmlns="{PACKAGE_REL_NS}">{"".join(sheet_rels)}</Relationships>',
+        )
+
+
+def inline_row(row: int, values: dict[str, str]) -> str:
+    cells = "".join(
+        f'<c r="{col}{row}" t="inlineStr"><is><t>{value}</t></is></c>' for col, value in values.items()
+    )
+    return f'<row r="{row}">{cells}</row>'
 
 
 def ground_truth_counts(path) -> dict[str, int]:
@@ -81,3 +128,44 @@ def _count_object_recursive(elem: ET.Element) -> tuple[int, int]:
 
 def _local_name(tag: str) -> str:
     return tag.rsplit("}", 1)[-1]
+
+
+def shape_anchor(name: str, text: str, col_from: int, row_from: int, col_to: int, row_to: int) -> str:
+    return (
+        "<xdr:twoCellAnchor>"
+        f"<xdr:from><xdr:col>{col_from}</xdr:col><xdr:colOff>0</xdr:colOff>"
+        f"<xdr:row>{row_from}</xdr:row><xdr:rowOff>0</xdr:rowOff></xdr:from>"
+        f"<xdr:to><xdr:col>{col_to}</xdr:col><xdr:colOff>0</xdr:colOff>"
+        f"<xdr:row>{row_to}</xdr:row><xdr:rowOff>0</xdr:rowOff></xdr:to>"
+        f'<xdr:sp><xdr:nvSpPr><xdr:cNvPr id="2" name="{name}"/><xdr:cNvSpPr/></xdr:nvSpPr>'
+        '<xdr:spPr><a:prstGeom prst="rect"/></xdr:spPr>'
+        f"<xdr:txBody><a:bodyPr/><a:p><a:r><a:t>{text}</a:t></a:r></a:p></xdr:txBody></xdr:sp>"
+        "<xdr:clientData/></xdr:twoCellAnchor>"
+    )
+
+
+_SAMPLE_SHEETS = (
+    ("First", "A1:B2", 1, {"A": "alpha", "B": "beta"}),
+    ("Second", "A1:A1", 1, {"A": "gamma"}),
+    ("Third", "C3:C3", 3, {"C": "delta"}),
+)
+
+
+def write_multi_sheet_xlsx(path, sheet_count: int) -> None:
+    write_minimal_xlsx(
+        path,
+        {
+            name: f'<dimension ref="{ref}"/><sheetData>{inline_row(row, values)}</sheetData>'
+            for name, ref, row, values in _SAMPLE_SHEETS[:sheet_count]
+        },
+    )
+
+
+def write_shapes_xlsx(path) -> None:
+    """Write a "Data" sheet without drawings and a "Shapes" sheet with one box and no connectors."""
+    body = f'<dimension ref="A1:D4"/><sheetData>{inline_row(1, {"A": "x"})}</sheetData>'
+    write_minimal_xlsx(
+        path,
+        {"Data": body, "Shapes": body},
+        drawings={"Shapes": shape_anchor("Box", "Box", 1, 1, 3, 3)},
+    )
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from excelmd.api import load_xlsx
+from excelmd.parser import regions
+from tests.helpers import inline_row, write_minimal_xlsx
+
+
+def _write_tied_regions(path) -> None:
+    # A1 alone, and a ring whose min row (C1) and min col (A4) also meet at A1.
+    rows = [
+        inline_row(1, {"A": "solo", "C": "c1", "D": "d1", "E": "e1", "F": "f1", "G": "g1"}),
+        inline_row(2, {"G": "g2"}),
+        inline_row(3, {"G": "g3"}),
+        inline_row(4, {"A": "a4", "B": "b4", "C": "c4", "D": "d4", "E": "e4", "F": "f4", "G": "g4"}),
+    ]
+    sheet_data = "".join(rows)
+    write_minimal_xlsx(path, {"S": f'<dimension ref="A1:G4"/><sheetData>{sheet_data}</sheetData>'})
+
+
+def test_region_tie_order_matches_set_based_search(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "tie.xlsx"
+    _write_tied_regions(path)
+
+    grid_refs = [region.bounds.ref for region in load_xlsx(path).sheets[0].regions]
+    monkeypatch.setattr(regions, "_MAX_GRID_CELLS", 0)
+    set_refs = [region.bounds.ref for region in load_xlsx(path).sheets[0].regions]
+
+    assert grid_refs == ["A1:G4", "A1:A1"]
+    assert grid_refs == set_refs
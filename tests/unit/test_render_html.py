@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import pytest
+
+from excelmd import render_html
+from excelmd.api import convert_xlsx_to_html, write_xlsx_html
+from excelmd.render_html import _clean_hf_text, _decode_header_footer
+from tests.helpers import write_multi_sheet_xlsx, write_shapes_xlsx
+
+
+def test_html_workers_match_serial_output(tmp_path) -> None:
+    path = tmp_path / "book.xlsx"
+    write_multi_sheet_xlsx(path, 3)
+
+    serial = convert_xlsx_to_html(path)
+
+    assert convert_xlsx_to_html(path, workers=2) == serial
+    assert "Sheet: Third" in serial
+
+
+def test_write_xlsx_html_matches_convert(tmp_path) -> None:
+    path = tmp_path / "book.xlsx"
+    output = tmp_path / "book.html"
+    write_multi_sheet_xlsx(path, 3)
+
+    write_xlsx_html(path, output)
+
+    assert output.read_text(encoding="utf-8") == convert_xlsx_to_html(path)
+
+
+def test_write_xlsx_html_keeps_existing_file_on_render_error(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "book.xlsx"
+    output = tmp_path / "book.html"
+    write_multi_sheet_xlsx(path, 3)
+    output.write_text("previous", encoding="utf-8")
+
+    def broken_sheet_html(sheet, fragments):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(render_html, "_sheet_html", broken_sheet_html)
+    with pytest.raises(RuntimeError):
+        write_xlsx_html(path, output)
+
+    assert output.read_text(encoding="utf-8") == "previous"
+
+
+def test_header_footer_codes_are_decoded() -> None:
+    assert _clean_hf_text("&&P", "Sheet1") == "&P"
+    assert _clean_hf_text("&&&&A&B&I", "Sheet1") == "&&A"
+    assert _clean_hf_text("&A", "Sheet1") == "Sheet1"
+    assert _clean_hf_text("Page &P of &N", "Sheet1") == "Page {page} of {pages}"
+    assert _clean_hf_text('&"Arial,Bold"&14Title', "Sheet1") == "Title"
+    assert _clean_hf_text("&KFF0000Red &UText", "Sheet1") == "Red Text"
+
+
+def test_header_footer_sections_are_split() -> None:
+    raw = '&LLeft &P&C&"Meiryo,Regular"&12Center&RRight &A'
+
+    assert _decode_header_footer(raw, "Sheet1") == {"L": "Left {page}", "C": "Center", "R": "Right Sheet1"}
+    assert _decode_header_footer("Plain &&co", "Sheet1") == {"L": "", "C": "Plain &co", "R": ""}
+
+
+def test_overlay_omits_svg_without_lines(tmp_path) -> None:
+    path = tmp_path / "shapes.xlsx"
+    write_shapes_xlsx(path)
+
+    html = convert_xlsx_to_html(path)
+    data_part, shapes_part = html.split("Sheet: Shapes", 1)
+
+    assert '<div class="sv-overlay"></div>\n' in data_part
+    assert 'class="sv-shape"' not in data_part
+    assert '<div class="sv-overlay">\n<div class="sv-shape"' in shapes_part
+    assert ">Box</div>\n</div>\n" in shapes_part
+    assert "<svg" not in html
+    assert "<defs>" not in html
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import pytest
+
+from excelmd import render_markdown
+from excelmd.api import convert_xlsx_to_markdown, load_xlsx, write_xlsx_markdown
+from excelmd.model import ConvertOptions
+from excelmd.render_markdown import render_workbook_markdown
+from tests.helpers import write_multi_sheet_xlsx, write_shapes_xlsx
+
+
+def test_full_mode_rerender_reflects_style_changes(tmp_path) -> None:
+    path = tmp_path / "book.xlsx"
+    write_multi_sheet_xlsx(path, 2)
+    workbook = load_xlsx(path, options=ConvertOptions(output_mode="full"))
+
+    assert "injected" not in render_workbook_markdown(workbook)
+    workbook.styles_xml_equivalent["injected"] = 1
+    assert '"injected": 1' in render_workbook_markdown(workbook)
+
+
+def test_compact_mode_drops_empty_sections_only(tmp_path) -> None:
+    path = tmp_path / "book.xlsx"
+    write_multi_sheet_xlsx(path, 2)
+
+    default = convert_xlsx_to_markdown(path)
+    compact = convert_xlsx_to_markdown(path, compact=True)
+
+    assert default == convert_xlsx_to_markdown(path, compact=False)
+    assert "## Defined Names\n\n(none)\n" in default
+    assert "### Input Rules\n\n(none)\n" in default
+    assert "## Warnings\n\n(none)\n" in default
+
+    compact_lines = compact.splitlines()
+    assert "(none)" not in compact_lines
+    for heading in ("## Defined Names", "### Input Rules", "### Image Assets", "## Warnings"):
+        assert heading not in compact_lines
+    for heading in ("## Sheet: First [visible]", "### Region Workspaces", "## Extraction Summary", "## Mode"):
+        assert heading in compact_lines
+
+    remaining = iter(default.splitlines())
+    assert all(line in remaining for line in compact_lines)
+
+
+def test_markdown_workers_match_serial_output(tmp_path) -> None:
+    path = tmp_path / "book.xlsx"
+    write_multi_sheet_xlsx(path, 2)
+
+    for mode in ("work", "full", "sheetview"):
+        options = ConvertOptions(output_mode=mode)
+        serial = convert_xlsx_to_markdown(path, options=options)
+        assert convert_xlsx_to_markdown(path, options=options, workers=2) == serial
+
+
+def test_write_xlsx_markdown_matches_convert(tmp_path) -> None:
+    path = tmp_path / "book.xlsx"
+    output = tmp_path / "book.md"
+    write_multi_sheet_xlsx(path, 2)
+
+    for compact in (False, True):
+        write_xlsx_markdown(path, output, compact=compact)
+        assert output.read_text(encoding="utf-8") == convert_xlsx_to_markdown(path, compact=compact)
+
+
+def test_write_xlsx_markdown_keeps_existing_file_on_render_error(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "book.xlsx"
+    output = tmp_path / "book.md"
+    write_multi_sheet_xlsx(path, 2)
+    output.write_text("previous", encoding="utf-8")
+
+    def broken_sheet_lines(sheet):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(render_markdown, "_work_sheet_lines", broken_sheet_lines)
+    with pytest.raises(RuntimeError):
+        write_xlsx_markdown(path, output)
+
+    assert output.read_text(encoding="utf-8") == "previous"
+
+
+def test_sheetview_overlay_omits_svg_without_connectors(tmp_path) -> None:
+    path = tmp_path / "shapes.xlsx"
+    write_shapes_xlsx(path)
+
+    markdown = convert_xlsx_to_markdown(path, options=ConvertOptions(output_mode="sheetview"))
+    data_part, shapes_part = markdown.split("## Sheet: Shapes", 1)
+
+    assert '<div class="sv-overlay"></div>\n' in data_part
+    assert (
+        '<div class="sv-overlay">\n'
+        '<div class="sv-shape" style="left:64.0px;top:20.0px;width:128.0px;height:40.0px;">Box</div>\n'
+        "</div>\n"
+    ) in shapes_part
+    assert "<svg" not in markdown
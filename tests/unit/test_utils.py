@@ -6,6 +6,8 @@ from excelmd.parser.utils import (
     index_to_col,
     parse_range_ref,
     parse_sheet_scoped_range,
+    parse_sqref,
+    resolve_target,
     rowcol_to_coord,
 )
 
@@ -34,3 +36,17 @@ def test_parse_sheet_scoped_range() -> None:
     assert len(ranges) == 2
     assert ranges[0].ref == "A1:C3"
     assert ranges[1].ref == "D5"
+
+
+def test_parse_sqref() -> None:
+    ranges = parse_sqref("B8:$B$10  D11 bogus A1:B")
+    assert [r.ref for r in ranges] == ["B8:B10", "D11"]
+    assert (ranges[0].start_row, ranges[0].start_col, ranges[0].end_row, ranges[0].end_col) == (8, 2, 10, 2)
+
+
+def test_resolve_target() -> None:
+    assert resolve_target("xl/workbook.xml", "worksheets/sheet1.xml") == "xl/worksheets/sheet1.xml"
+    assert resolve_target("xl/drawings/drawing1.xml", "../media/image1.png") == "xl/media/image1.png"
+    assert resolve_target("xl/workbook.xml", "/xl/worksheets/sheet2.xml") == "xl/worksheets/sheet2.xml"
+    assert resolve_target("xl/workbook.xml", "./worksheets/../styles.xml") == "xl/styles.xml"
+    assert resolve_target("workbook.xml", "../../x.xml") == "../../x.xml"